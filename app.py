@@ -1,274 +1,380 @@
 import streamlit as st
 import base64
+import binascii
+import numpy as np
 import pandas as pd
 import json
+import hashlib
+import os
+import string
+import concurrent.futures
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional
 from patternanalyzer.engine import Engine
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
 st.set_page_config(page_title="Pattern Analyzer Analizi", layout="wide", page_icon="🔬")
 
-engine = Engine()
+@st.cache_resource
+def get_engine():
+    # Streamlit re-executes this script on every rerun; share one Engine per process
+    return Engine()
+
+# Tuples: the cached value is shared by reference, so keep it immutable
+@st.cache_resource
+def get_available_tests():
+    return tuple(get_engine().get_available_tests())
+
+@st.cache_resource
+def get_available_transforms():
+    return tuple(get_engine().get_available_transforms())
+
+DEFAULT_TESTS = ("monobit", "approximate_entropy", "autocorrelation")  # From HTML
+
+@st.cache_resource
+def get_default_tests():
+    # Resolved once per process against the installed plugins
+    available = frozenset(get_available_tests())
+    return tuple(t for t in DEFAULT_TESTS if t in available)
+
+@st.cache_resource
+def get_executor():
+    # Analyses run off the script thread so reruns (and Clear) stay responsive
+    return concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="analysis")
+
+def analyze_isolated(input_bytes, config):
+    # Sessions' analyses overlap on the shared executor, and an Engine's worker
+    # pool and log handlers are per-instance state: give each run its own Engine
+    run_engine = Engine()
+    try:
+        return run_engine.analyze(input_bytes, config)
+    finally:
+        run_engine.close()
+
+engine = get_engine()
+
+# Columns of the findings table, in display order
+EXPECTED_COLUMNS = (
+    'test_name', 'passed', 'p_value', 'p_values', 'effect_sizes', 'flags',
+    'z_score', 'evidence', 'time_ms', 'bytes_processed', 'status',
+    'fdr_rejected', 'fdr_q', 'visuals', 'reason', 'metrics',
+)
+# Scalar numeric columns; float64 keeps p-values exact in the table
+NUMERIC_COLUMNS = ('p_value', 'z_score', 'time_ms', 'bytes_processed', 'fdr_q')
+
+@dataclass(frozen=True, slots=True)
+class AnalysisView:
+    """Engine output normalized once when stored, so reruns only read attributes."""
+    results: list
+    scorecard: dict
+    error: Optional[str] = None
+    # Content hash of the payload: the cache key for prepare_results
+    key: Optional[str] = None
+
+    @classmethod
+    def from_result(cls, result):
+        if not isinstance(result, dict):
+            return cls(results=[], scorecard={})
+        if 'error' in result:
+            return cls(results=[], scorecard={}, error=result['error'])
+        results = result.get('results') or []
+        # Convert dict keys in metrics to str for Arrow compatibility, once at ingestion
+        for r in results:
+            m = r.get('metrics') if isinstance(r, dict) else None
+            if isinstance(m, dict) and not all(isinstance(k, str) for k in m):
+                r['metrics'] = {str(k): v for k, v in m.items()}
+        key = hashlib.sha256(json.dumps(result, default=str).encode('utf-8')).hexdigest()
+        return cls(
+            results=results,
+            scorecard=result.get('scorecard') or {},
+            key=key,
+        )
+
+_B64_ALPHABET = frozenset(string.ascii_letters + string.digits + '+/=')
+
+def decode_text_input(text):
+    """Decode text as strict base64, falling back to its UTF-8 bytes."""
+    # Non-ASCII text can never be base64; skip the decode attempt entirely
+    if not text.isascii():
+        return text.encode('utf-8')
+    # base64/MIME encoders wrap at 76 columns and text areas add a trailing
+    # newline: whitespace is not part of the payload
+    candidate = ''.join(text.split())
+    # Cheap up-front classification: strict base64 is a multiple of 4 long and
+    # drawn from the base64 alphabet, so most plain text is rejected before decoding
+    if len(candidate) % 4 or not _B64_ALPHABET.issuperset(candidate[:64]):
+        return text.encode('utf-8')
+    try:
+        return binascii.a2b_base64(candidate, strict_mode=True)
+    except binascii.Error:
+        return text.encode('utf-8')
+    except TypeError:
+        # Python < 3.11 has no strict_mode
+        try:
+            return base64.b64decode(candidate, validate=True)
+        except binascii.Error:
+            return text.encode('utf-8')
 
 def run_analysis(config):
+    """Submit the analysis in the background; returns False when there is no input."""
     # input_bytes'ı hesaplayalım
-    input_bytes = b""
-    if config.get('data', {}).get('file'):
-        uploaded_file = config['data']['file']
-        if uploaded_file is not None:
-            input_bytes = uploaded_file.read()
-    elif config.get('data', {}).get('text'):
-        text = config['data']['text']
-        if text:
-            # Try to decode as base64, fallback to utf-8 encode
-            try:
-                input_bytes = base64.b64decode(text)
-            except Exception:
-                input_bytes = text.encode('utf-8')
+    data = config.get('data') or {}
+    uploaded_file = data.get('file')
+    text = data.get('text')
+    if uploaded_file is not None:
+        # UploadedFile is a BytesIO over the bytes Streamlit already received;
+        # getvalue() returns that same object (no copy), whereas read() or
+        # spilling to a temp file + mmap would add a full copy / disk I/O
+        input_bytes = uploaded_file.getvalue()
+    elif text:
+        input_bytes = decode_text_input(text)
+    else:
+        return False
+
+    # engine.analyze çağrısı doğru parametrelerle; sonucu collect_analysis toplar
+    st.session_state['analysis_future'] = get_executor().submit(analyze_isolated, input_bytes, config)
+    return True
+
+def collect_analysis(lang):
+    """Move a finished background analysis into session state.
+
+    Returns True while an analysis is still running.
+    """
+    fut = st.session_state.get('analysis_future')
+    if fut is None:
+        return False
+    if not fut.done():
+        return True
+    del st.session_state['analysis_future']
+    try:
+        st.session_state['analysis_result'] = AnalysisView.from_result(fut.result())
+    except Exception as e:
+        st.session_state['analysis_result'] = AnalysisView(
+            results=[], scorecard={}, error=lang['analysis_error'].format(error=str(e))
+        )
+    return False
+
+@st.fragment(run_every=0.5)
+def analysis_progress(lang):
+    # Only this fragment reruns while polling; a full rerun renders the results
+    if collect_analysis(lang):
+        st.info(lang['analyzing'])
+    else:
+        st.rerun()
 
-    # engine.analyze çağrısı doğru parametrelerle
-    result = engine.analyze(input_bytes, config)
-    st.session_state['analysis_result'] = result
+@st.cache_data(show_spinner=False, max_entries=8)
+def prepare_results(result_key, _results, columns):
+    """Build the findings table, scorecard counts, numeric p-values and selectbox labels once per payload.
+
+    Only ``result_key`` (a content hash) is hashed by Streamlit; ``_results`` is
+    skipped, so reruns neither rebuild nor rehash the result list.
+    """
+    # from_records with explicit columns adds missing ones as NaN, no reindex pass
+    df = pd.DataFrame.from_records(_results, columns=columns)
+    # Give scalar numeric columns a real float dtype instead of inferred object columns
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    p_numeric = df['p_value'].to_numpy(dtype=float)
+    option_labels = [f"{i} - {r.get('test_name', 'Unknown')}" for i, r in enumerate(_results)]
+    return df, count_results(df), p_numeric, option_labels
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def result_json(result_key, idx, _result):
+    """Pretty-printed JSON for one result, serialized once per (payload, index)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                _result,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            ).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(_result, indent=2, default=str, ensure_ascii=False)
+
+def set_selection(key, values):
+    """Button callback: replace a multiselect's selection in session state."""
+    st.session_state[key] = list(values)
+
+def count_results(df):
+    """Return (total, run, skipped, failed) counts from the findings table."""
+    if df is None:
+        return 0, 0, 0, 0
+    total_tests = len(df)
+    skipped_mask = (df['status'] == 'skipped').to_numpy()
+    # Results without a 'passed' value are not counted as failures
+    passed = df['passed'].fillna(True).to_numpy(dtype=bool)
+    skipped_tests = int(skipped_mask.sum())
+    failed_tests = int((~passed & ~skipped_mask).sum())
+    return total_tests, total_tests - skipped_tests, skipped_tests, failed_tests
+
+def inline_svg(svg_bytes):
+    """Return SVG markup that can be embedded in an st.markdown HTML block."""
+    text = svg_bytes.decode('utf-8', errors='replace').strip()
+    # An XML prolog is not valid inside HTML, and a blank line would end the HTML block
+    if text.startswith('<?xml'):
+        text = text[text.find('?>') + 2:].lstrip()
+    return '\n'.join(line for line in text.splitlines() if line.strip())
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def decode_visuals(result_key, idx, _visuals):
+    """Split one result's visual artifacts into SVG markup and raster images.
+
+    Decoded once per (payload, result index), so reselecting a result does not
+    base64-decode its visuals again. Per-item problems come back as
+    ``(lang_key, name, error)`` tuples for the caller to report.
+    """
+    svg_tags, images, captions, problems = [], [], [], []
+    for vname, vdata in _visuals.items():
+        if not isinstance(vdata, dict):
+            problems.append(('visual_format_error', vname, None))
+            continue
+        if 'data_base64' in vdata:
+            try:
+                mime = vdata.get('mime', 'image/svg+xml')
+                base64_data = vdata['data_base64']
+                if mime == 'image/svg+xml':
+                    # Inline the markup instead of a base64 data: URL (~25% smaller on the wire)
+                    svg_tags.append(inline_svg(binascii.a2b_base64(base64_data)))
+                else:
+                    images.append(binascii.a2b_base64(base64_data))
+                    captions.append(vname)
+            except Exception as e:
+                problems.append(('visual_error', vname, str(e)))
+        elif 'path' in vdata:
+            images.append(vdata['path'])
+            captions.append(vname)
+    return svg_tags, images, captions, problems
+
+def _join_bounded(parts, max_len):
+    """', '.join(parts) truncated to max_len, without building the full string."""
+    out, n = [], -2
+    for p in parts:
+        out.append(p)
+        n += len(p) + 2
+        if n > max_len:
+            break
+    val_str = ', '.join(out)
+    return val_str[:max_len] + '...' if len(val_str) > max_len else val_str
 
 def format_val(v, lang_code='tr', max_len=50):
     if v is None:
         return "None"
     if isinstance(v, dict):
-        items = []
-        for kk, vv in v.items():
-            if isinstance(vv, (int, float)):
-                items.append(f"{kk}: {vv}")
-            else:
-                items.append(f"{kk}: {str(vv)[:20]}...")
-        val_str = ', '.join(items)
-        if len(val_str) > max_len:
-            val_str = val_str[:max_len] + '...'
-        return val_str
+        return _join_bounded(
+            (f"{kk}: {vv}" if isinstance(vv, (int, float)) else f"{kk}: {str(vv)[:20]}..." for kk, vv in v.items()),
+            max_len,
+        )
     elif isinstance(v, list):
-        return ', '.join(map(str, v))[:max_len] + '...' if len(', '.join(map(str, v))) > max_len else ', '.join(map(str, v))
+        return _join_bounded(map(str, v), max_len)
     return str(v)
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def format_scorecard(result_key, _scorecard):
+    """Formatted scorecard metric strings, computed once per payload."""
+    return (
+        format_val(_scorecard.get('mean_effect_size', 'None')),
+        format_val(_scorecard.get('p_value_distribution', {}), max_len=40),
+    )
+
+@st.cache_resource
+def load_ui_strings():
+    """UI strings per language, read from templates/ui_strings.json once per process.
+
+    Streamlit re-executes this script on every rerun, so a dict literal here
+    would be rebuilt each time; the cached mapping is shared read-only.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "ui_strings.json")
+    with open(path, encoding="utf-8") as fh:
+        strings = json.load(fh)
+    return MappingProxyType({
+        code: MappingProxyType({k: MappingProxyType(v) if isinstance(v, dict) else v for k, v in table.items()})
+        for code, table in strings.items()
+    })
+
+@st.cache_data(show_spinner=False)
+def test_explanations_markdown(lang_code, tests):
+    """All test descriptions as one markdown blob (a single delta instead of one per test)."""
+    explanations = load_ui_strings()[lang_code]['test_explanations']
+    missing = "Açıklama yok." if lang_code == "tr" else "No description."
+    return "\n\n".join(f"**{t}**: {explanations.get(t, missing)}" for t in tests)
+
+@st.cache_resource
+def results_column_config(lang_code):
+    # Read-only config shared by reference; st.dataframe deep-copies it before use
+    explanations = load_ui_strings()[lang_code]['column_explanations']
+    return {col: st.column_config.TextColumn(help=explanations.get(col, '')) for col in EXPECTED_COLUMNS}
+
+def findings_table(result_key, df, p_numeric, fdr_q):
+    """Styled (or plain) findings table, reused across reruns for the same payload and q."""
+    cache_key = (result_key, fdr_q)
+    cached = st.session_state.get('_findings_table')
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+    # NaN (non-numeric / missing) p-values compare False
+    significant = p_numeric < fdr_q
+    if significant.any():
+        # Build the CSS column once; the Styler callback just hands it back
+        p_css = np.where(significant, 'background-color: red', '')
+        table = df.style.apply(lambda _: p_css, subset=['p_value'])
+    else:
+        # Nothing to highlight: skip the Styler codepath entirely
+        table = df
+    st.session_state['_findings_table'] = (cache_key, table)
+    return table
+
+@st.fragment
+def result_details(view, option_labels, lang, lang_code):
+    """Result picker and details pane; reruns on its own when the selection changes."""
+    selected_label = st.selectbox(lang['select_result'], options=option_labels)
+    if selected_label:
+        selected_idx = int(selected_label.split(" - ")[0])
+        selected_result = view.results[selected_idx]
+        st.subheader(lang['selected_details'])
+        st.code(result_json(view.key, selected_idx, selected_result), language='json')
+
+        # Test-specific explanation
+        test_name = selected_result.get('test_name')
+        desc = lang['test_explanations'].get(test_name, "Açıklama yok." if lang_code == "tr" else "No description.")
+        st.write(f"**Test Açıklaması**: {desc}")
+
+        # If skipped or error, show reason
+        status = selected_result.get('status')
+        if status == 'skipped' or status == 'error':
+            reason = selected_result.get('reason', 'Bilinmeyen neden' if lang_code == "tr" else 'Unknown reason')
+            st.warning(f"Bu test {status} oldu. Neden: {reason}")
+
+        # Visuals if any
+        visuals = selected_result.get('visuals', {})
+        if visuals:
+            st.subheader(lang['visuals'])
+            svg_tags, images, captions, problems = decode_visuals(view.key, selected_idx, visuals)
+            for lang_key, vname, err in problems:
+                if err is None:
+                    st.write(lang[lang_key].format(name=vname))
+                else:
+                    st.error(lang[lang_key].format(name=vname, error=err))
+            # One delta per kind instead of one Streamlit call per visual
+            if svg_tags:
+                st.markdown('\n'.join(svg_tags), unsafe_allow_html=True)
+            if images:
+                try:
+                    st.image(images, caption=captions, use_container_width=True)
+                except Exception as e:
+                    st.error(lang['visual_error'].format(name=', '.join(captions), error=str(e)))
+
 def main():
     # Language support
     if 'language' not in st.session_state:
         st.session_state.language = "en"
-    # TO DO (P3): Load language strings from an external file
-    lang = {
-        "tr": {
-            "main_title": "Pattern Analyzer Analiz Platformu",
-            "main_desc": "Bu platform, verilerinizde rastgelelik paternlerini analiz etmek için güçlü istatistiksel testler sunar. Dosya yükleyin veya doğrudan veri girin ve kapsamlı bir analiz raporu elde edin.",
-            "results_title": "Analiz Sonuçları",
-            "control_panel": "Kontrol Paneli",
-            "file_tab": "Dosya",
-            "text_tab": "Metin",
-            "file_label": "Dosya Seçin",
-            "file_help": "Limit 200MB per file • BIN, TXT, DAT",
-            "text_label": "Veri Girin",
-            "text_placeholder": "Base64 encoded data veya doğrudan metin girin...",
-            "test_selection": "Test Seçimi",
-            "tests_label": "Çalıştırılacak Testler",
-            "tests_help": "Çalıştırılacak testleri seçin. Her test, verinin rastgeleliğini farklı açılardan inceler. Örneğin, monobit testi 0 ve 1'lerin dağılımını kontrol eder.",
-            "all_tests": "Tüm Testleri Seç",
-            "no_tests": "Hiçbir Test Seçme",
-            "transform_selection": "Transform Seçimi",
-            "transforms_label": "Uygulanacak Transformlar",
-            "transforms_help": "Uygulanacak transformları seçin. Transformlar, veriyi dönüştürerek testlerin hassasiyetini artırabilir, örneğin XOR ile şifreleme paternlerini kırar.",
-            "all_transforms": "Tüm Transformları Seç",
-            "no_transforms": "Hiçbir Transform Seçme",
-            "analysis_settings": "Analiz Ayarları",
-            "fdr_label": "FDR Anlamlılık Düzeyi (q)",
-            "fdr_help": "FDR (False Discovery Rate) anlamlılık düzeyi. Düşük değer (ör. 0.05) daha katı test anlamına gelir; p-value < q ise test başarısız sayılır.",
-            "start_analysis": "Analizi Başlat",
-            "clear": "Temizle",
-            "analyzing": "Analiz yapılıyor...",
-            "analysis_error": "Analiz hatası: {error}",
-            "scorecard": "Scorecard",
-            "findings": "Bulgular",
-            "select_result": "Bir sonuç seçin",
-            "selected_details": "Seçilen Sonucun Detayları",
-            "visuals": "Görseller",
-            "visual_error": "Görsel gösterilemedi ({name}): {error}",
-            "visual_format_error": "Görsel formatı yanlış: {name}",
-            "no_results": "Analiz sonucu boş veya yok.",
-            "language": "Dil",
-            "failed_tests": "Başarısız Testler",
-            "mean_effect_size": "Ortalama Etki Boyutu",
-            "mean_effect_size_desc": "Testlerin etki boyutlarının ortalaması (ör. sapma miktarı). None ise yeterli veri yok veya hesaplanmadı.",
-            "p_value_distribution": "P-Değeri Dağılımı",
-            "p_value_distribution_desc": "P-değerlerinin istatistikleri (adet, ortalama, medyan vb.). Rastgele veride p-değerleri uniform dağılımlı olmalı.",
-            "total_tests": "Toplam Testler",
-            "fdr_q": "FDR q",
-            "skipped_tests": "Atlanan Testler",
-            "skipped_tests_desc": "Atlanan testler: Veri boyutu yetersiz veya önkoşullar sağlanmadı. Detaylar sonuç tablosunda 'reason' sütununda.",
-            "run_tests": "Çalıştırılan Testler",
-            "test_explanations": {
-                "monobit": "Monobit testi: Verideki 0 ve 1'lerin sayısını kontrol eder. Rastgele veride yaklaşık eşit olmalı.",
-                "approximate_entropy": "Approximate Entropy: Verinin tahmin edilemezliğini ölçer. Düşük entropi düzenli patern gösterir.",
-                "autocorrelation": "Autocorrelation: Verinin kendisiyle gecikmeli korelasyonunu hesaplar. Yüksek değer periyodiklik belirtir.",
-                "autoencoder_anomaly": "Autoencoder Anomaly: Makine öğrenmesiyle anomalileri tespit eder.",
-                "binary_matrix_rank": "Binary Matrix Rank: Matris rank testi, lineer bağımlılıkları kontrol eder.",
-                "block_frequency": "Block Frequency: Bloklardaki frekans dağılımını test eder.",
-                "classifier_labeler": "Classifier Labeler: Sınıflandırıcı ile veriyi etiketler.",
-                "conditional_entropy": "Conditional Entropy: Koşullu entropi, bağımlılıkları ölçer.",
-                "cusum": "Cumulative Sums: Kümülatif toplam testi, sapmaları tespit eder.",
-                "dft_spectral_advanced": "DFT Spectral Advanced: Spektral analiz, frekans paternlerini arar.",
-                "diehard_3d_spheres": "Diehard 3D Spheres: 3D küre testi (veri yetersizse hata verir).",
-                "diehard_birthday_spacings": "Diehard Birthday Spacings: Doğum günü aralık testi.",
-                "diehard_overlapping_sums": "Diehard Overlapping Sums: Çakışan toplamlar testi.",
-                "dotplot": "Dotplot: Veri paternlerini görselleştirir.",
-                "ecb_detector": "ECB Detector: ECB modunda şifreleme paternlerini arar.",
-                "fft_spectral": "FFT Spectral: Frekans domain analizi.",
-                "frequency_pattern": "Frequency Pattern: Frekans paternleri ve Vigenere anahtar uzunluğu tahmini.",
-                "hurst_exponent": "Hurst Exponent: Uzun vadeli bağımlılık ölçüsü.",
-                "known_constants_search": "Known Constants Search: Bilinen sabitleri arar.",
-                "linear_complexity": "Linear Complexity: Lineer karmaşıklık testi.",
-                "longest_run_ones": "Longest Run of Ones: En uzun 1'ler dizisi testi.",
-                "lstm_gru_anomaly": "LSTM GRU Anomaly: Zaman serisi anomalileri tespit eder.",
-                "lz_complexity": "LZ Complexity: Lempel-Ziv karmaşıklığı.",
-                "magic_detector": "Magic Detector: Dosya tipi sihirli baytları arar.",
-                "maurers_universal": "Maurer's Universal: Evrensel istatistik testi.",
-                "mutual_information": "Mutual Information: Karşılıklı bilgi ölçüsü.",
-                "nist_dft_spectral": "NIST DFT Spectral: NIST spektral testi.",
-                "non_overlapping_template_matching": "Non-Overlapping Template: Çakışmayan şablon eşleştirme.",
-                "overlapping_template_matching": "Overlapping Template: Çakışan şablon eşleştirme.",
-                "blocking": "Blocking: Bloklama testi.",
-                "quickstat": "Quickstat: Hızlı istatistik özeti.",
-                "pdf_structure": "PDF Structure: PDF yapı analizi.",
-                "png_structure": "PNG Structure: PNG yapı analizi.",
-                "random_excursions": "Random Excursions: Rastgele gezinti testi.",
-                "random_excursions_variant": "Random Excursions Variant: Gezinti varyantı.",
-                "runs": "Runs: Runs testi, değişim sayısını kontrol eder.",
-                "serial": "Serial: Seri korelasyon testi.",
-                "testu01_smallcrush": "TestU01 SmallCrush: Küçük ezme test paketi.",
-                "transfer_entropy": "Transfer Entropy: Bilgi transferi ölçüsü.",
-                "zip_structure": "ZIP Structure: ZIP arşiv yapı analizi.",
-            },
-            "column_explanations": {
-                "test_name": "Test adı",
-                "passed": "Geçti mi? (True: Rastgelelik kabul edildi)",
-                "p_value": "P-değeri: Düşükse (<0.05) veri rastgele değil. None ise test p-value üretmedi (betimsel test).",
-                "p_values": "Alt p-değerleri (çoklu alt-test varsa).",
-                "effect_sizes": "Etki boyutu: Sapma miktarı.",
-                "flags": "Ek bayraklar.",
-                "z_score": "Z-skoru: Standart sapma cinsinden sapma.",
-                "evidence": "Kanıt/ek detaylar.",
-                "time_ms": "İşlem süresi (ms).",
-                "bytes_processed": "İşlenen bayt miktarı.",
-                "status": "Durum: completed (tamamlandı), skipped (atlandı), error (hata).",
-                "fdr_rejected": "FDR ile reddedildi mi?",
-                "fdr_q": "FDR eşiği.",
-                "visuals": "Görseller (eğer varsa).",
-                "reason": "Atlanma veya hata nedeni (ör. yetersiz veri).",
-                "metrics": "Ek metrikler.",
-            }
-        },
-        "en": {
-            "main_title": "Pattern Analyzer Analysis Platform",
-            "main_desc": "This platform offers powerful statistical tests to analyze randomness patterns in your data. Upload a file or enter data directly and get a comprehensive analysis report.",
-            "results_title": "Analysis Results",
-            "control_panel": "Control Panel",
-            "file_tab": "File",
-            "text_tab": "Text",
-            "file_label": "Select File",
-            "file_help": "Limit 200MB per file • BIN, TXT, DAT",
-            "text_label": "Enter Data",
-            "text_placeholder": "Base64 encoded data or plain text...",
-            "test_selection": "Test Selection",
-            "tests_label": "Tests to Run",
-            "tests_help": "Select tests to run. Each test examines randomness from different angles. For example, monobit checks the balance of 0s and 1s.",
-            "all_tests": "Select All Tests",
-            "no_tests": "Select No Tests",
-            "transform_selection": "Transform Selection",
-            "transforms_label": "Transforms to Apply",
-            "transforms_help": "Select transforms to apply. Transforms modify data to enhance test sensitivity, e.g., XOR to break encryption patterns.",
-            "all_transforms": "Select All Transforms",
-            "no_transforms": "Select No Transforms",
-            "analysis_settings": "Analysis Settings",
-            "fdr_label": "FDR Significance Level (q)",
-            "fdr_help": "FDR (False Discovery Rate) significance level. Lower value (e.g., 0.05) means stricter testing; p-value < q fails the test.",
-            "start_analysis": "Start Analysis",
-            "clear": "Clear",
-            "analyzing": "Analyzing...",
-            "analysis_error": "Analysis error: {error}",
-            "scorecard": "Scorecard",
-            "findings": "Findings",
-            "select_result": "Select a result",
-            "selected_details": "Selected Result Details",
-            "visuals": "Visuals",
-            "visual_error": "Could not display visual ({name}): {error}",
-            "visual_format_error": "Invalid visual format: {name}",
-            "no_results": "No analysis results or empty.",
-            "language": "Language",
-            "failed_tests": "Failed Tests",
-            "mean_effect_size": "Mean Effect Size",
-            "mean_effect_size_desc": "Average effect sizes from tests (e.g., deviation measure). None if insufficient data or not calculated.",
-            "p_value_distribution": "P-Value Distribution",
-            "p_value_distribution_desc": "Statistics of p-values (count, mean, median, etc.). In random data, p-values should be uniformly distributed.",
-            "total_tests": "Total Tests",
-            "fdr_q": "FDR q",
-            "skipped_tests": "Skipped Tests",
-            "skipped_tests_desc": "Skipped tests: Insufficient data size or preconditions not met. Details in 'reason' column of results table.",
-            "run_tests": "Run Tests",
-            "test_explanations": {
-                "monobit": "Monobit test: Checks the proportion of 0s and 1s. Should be approximately equal in random data.",
-                "approximate_entropy": "Approximate Entropy: Measures unpredictability. Low entropy indicates regular patterns.",
-                "autocorrelation": "Autocorrelation: Computes lagged correlation. High values indicate periodicity.",
-                "autoencoder_anomaly": "Autoencoder Anomaly: Detects anomalies using machine learning.",
-                "binary_matrix_rank": "Binary Matrix Rank: Tests for linear dependencies in matrices.",
-                "block_frequency": "Block Frequency: Tests frequency distribution in blocks.",
-                "classifier_labeler": "Classifier Labeler: Labels data using a classifier.",
-                "conditional_entropy": "Conditional Entropy: Measures dependencies.",
-                "cusum": "Cumulative Sums: Detects deviations in cumulative sums.",
-                "dft_spectral_advanced": "DFT Spectral Advanced: Spectral analysis for frequency patterns.",
-                "diehard_3d_spheres": "Diehard 3D Spheres: 3D sphere test (errors if data insufficient).",
-                "diehard_birthday_spacings": "Diehard Birthday Spacings: Birthday spacing test.",
-                "diehard_overlapping_sums": "Diehard Overlapping Sums: Overlapping sums test.",
-                "dotplot": "Dotplot: Visualizes data patterns.",
-                "ecb_detector": "ECB Detector: Searches for ECB mode encryption patterns.",
-                "fft_spectral": "FFT Spectral: Frequency domain analysis.",
-                "frequency_pattern": "Frequency Pattern: Frequency patterns and Vigenere key length estimation.",
-                "hurst_exponent": "Hurst Exponent: Measures long-term dependencies.",
-                "known_constants_search": "Known Constants Search: Searches for known constants.",
-                "linear_complexity": "Linear Complexity: Linear complexity test.",
-                "longest_run_ones": "Longest Run of Ones: Longest sequence of 1s test.",
-                "lstm_gru_anomaly": "LSTM GRU Anomaly: Detects time series anomalies.",
-                "lz_complexity": "LZ Complexity: Lempel-Ziv complexity.",
-                "magic_detector": "Magic Detector: File type magic bytes search.",
-                "maurers_universal": "Maurer's Universal: Universal statistical test.",
-                "mutual_information": "Mutual Information: Mutual information measure.",
-                "nist_dft_spectral": "NIST DFT Spectral: NIST spectral test.",
-                "non_overlapping_template_matching": "Non-Overlapping Template: Non-overlapping template matching.",
-                "overlapping_template_matching": "Overlapping Template: Overlapping template matching.",
-                "blocking": "Blocking: Blocking test.",
-                "quickstat": "Quickstat: Quick statistical summary.",
-                "pdf_structure": "PDF Structure: PDF structure analysis.",
-                "png_structure": "PNG Structure: PNG structure analysis.",
-                "random_excursions": "Random Excursions: Random excursion test.",
-                "random_excursions_variant": "Random Excursions Variant: Excursion variant.",
-                "runs": "Runs: Runs test, checks number of changes.",
-                "serial": "Serial: Serial correlation test.",
-                "testu01_smallcrush": "TestU01 SmallCrush: Small crush test battery.",
-                "transfer_entropy": "Transfer Entropy: Information transfer measure.",
-                "zip_structure": "ZIP Structure: ZIP archive structure analysis.",
-            },
-            "column_explanations": {
-                "test_name": "Test name",
-                "passed": "Passed? (True: Randomness accepted)",
-                "p_value": "P-value: Low (<0.05) means non-random. None if test doesn't produce p-value (descriptive).",
-                "p_values": "Sub p-values (for multi-subtests).",
-                "effect_sizes": "Effect size: Deviation measure.",
-                "flags": "Additional flags.",
-                "z_score": "Z-score: Deviation in standard deviations.",
-                "evidence": "Evidence/extra details.",
-                "time_ms": "Processing time (ms).",
-                "bytes_processed": "Processed bytes.",
-                "status": "Status: completed, skipped, error.",
-                "fdr_rejected": "Rejected by FDR?",
-                "fdr_q": "FDR threshold.",
-                "visuals": "Visuals (if any).",
-                "reason": "Reason for skip or error (e.g., insufficient data).",
-                "metrics": "Additional metrics.",
-            }
-        }
-    }[st.session_state.language]
+    # session_state attribute reads go through Streamlit's proxy; resolve once per rerun
+    lang_code = st.session_state.language
+    lang = load_ui_strings()[lang_code]
 
     # Main content
     st.markdown(f"""
@@ -282,8 +388,8 @@ def main():
     # Sidebar
     with st.sidebar:
         # Language selector
-        selected_lang = st.selectbox(lang['language'], options=["tr", "en"], format_func=lambda x: "Türkçe" if x == "tr" else "English", index=0 if st.session_state.language == "tr" else 1)
-        if selected_lang != st.session_state.language:
+        selected_lang = st.selectbox(lang['language'], options=["tr", "en"], format_func=lambda x: "Türkçe" if x == "tr" else "English", index=0 if lang_code == "tr" else 1)
+        if selected_lang != lang_code:
             st.session_state.language = selected_lang
             st.rerun()
 
@@ -307,57 +413,51 @@ def main():
             )
 
         st.subheader(lang['test_selection'])
-        available_tests = engine.get_available_tests()
-        default_tests = ["monobit", "approximate_entropy", "autocorrelation"]  # From HTML
+        available_tests = get_available_tests()
 
         if 'selected_tests' not in st.session_state:
-            st.session_state.selected_tests = [t for t in default_tests if t in available_tests]
+            st.session_state.selected_tests = list(get_default_tests())
 
-        selected_tests = st.multiselect(
+        # Bound to st.session_state.selected_tests through key=
+        st.multiselect(
             lang['tests_label'],
             options=available_tests,
-            default=st.session_state.selected_tests,
+            key='selected_tests',
             help=lang['tests_help']
         )
 
         # Test açıklamaları için expander
-        with st.expander("Test Açıklamaları" if st.session_state.language == "tr" else "Test Explanations"):
-            for test in available_tests:
-                desc = lang['test_explanations'].get(test, "Açıklama yok." if st.session_state.language == "tr" else "No description.")
-                st.write(f"**{test}**: {desc}")
+        with st.expander("Test Açıklamaları" if lang_code == "tr" else "Test Explanations"):
+            st.markdown(test_explanations_markdown(lang_code, available_tests))
 
         col1, col2 = st.columns(2)
+        # on_click runs before the next script run, so the selection updates
+        # without a second, explicit st.rerun()
         with col1:
-            if st.button(lang['all_tests']):
-                st.session_state.selected_tests = available_tests
-                st.rerun()
+            st.button(lang['all_tests'], on_click=set_selection, args=('selected_tests', available_tests))
         with col2:
-            if st.button(lang['no_tests']):
-                st.session_state.selected_tests = []
-                st.rerun()
+            st.button(lang['no_tests'], on_click=set_selection, args=('selected_tests', []))
 
         st.subheader(lang['transform_selection'])
-        available_transforms = engine.get_available_transforms()
+        available_transforms = get_available_transforms()
 
         if 'selected_transforms' not in st.session_state:
             st.session_state.selected_transforms = []
 
-        selected_transforms = st.multiselect(
+        st.multiselect(
             lang['transforms_label'],
             options=available_transforms,
-            default=st.session_state.selected_transforms,
+            key='selected_transforms',
             help=lang['transforms_help']
         )
 
         col3, col4 = st.columns(2)
+        # on_click runs before the next script run, so the selection updates
+        # without a second, explicit st.rerun()
         with col3:
-            if st.button(lang['all_transforms']):
-                st.session_state.selected_transforms = available_transforms
-                st.rerun()
+            st.button(lang['all_transforms'], on_click=set_selection, args=('selected_transforms', available_transforms))
         with col4:
-            if st.button(lang['no_transforms']):
-                st.session_state.selected_transforms = []
-                st.rerun()
+            st.button(lang['no_transforms'], on_click=set_selection, args=('selected_transforms', []))
 
         st.subheader(lang['analysis_settings'])
         fdr_q = st.slider(
@@ -369,6 +469,14 @@ def main():
             format="%.2f",
             help=lang.get('fdr_help', '')
         )
+        max_workers = st.number_input(
+            lang['workers_label'],
+            min_value=1,
+            max_value=os.cpu_count() or 1,
+            value=1,
+            step=1,
+            help=lang['workers_help']
+        )
 
         col5, col6 = st.columns(2)
         with col5:
@@ -379,131 +487,71 @@ def main():
     # Handle buttons
     if clear_button:
         st.session_state.pop('analysis_result', None)
+        st.session_state.pop('analysis_future', None)
+        st.session_state.pop('_findings_table', None)
         st.session_state.pop('selected_tests', None)
         st.session_state.pop('selected_transforms', None)
         st.rerun()
 
     if start_button:
-        # Update session state
-        st.session_state.selected_tests = selected_tests
-        st.session_state.selected_transforms = selected_transforms
-
         # Build config
         config = {
             'data': {
                 'file': uploaded_file,
                 'text': text_input,
             },
-            'tests': [{'name': t, 'params': {}} for t in selected_tests],
-            'transforms': [{'name': tr, 'params': {}} for tr in selected_transforms],
+            'tests': [{'name': t, 'params': {}} for t in st.session_state.selected_tests],
+            'transforms': [{'name': tr, 'params': {}} for tr in st.session_state.selected_transforms],
             'fdr_q': fdr_q,
+            # More than one worker switches the engine to its process-pool path
+            'parallel': max_workers > 1,
+            'max_workers': int(max_workers),
         }
 
-        with st.spinner(lang['analyzing']):
-            try:
-                run_analysis(config)
-            except Exception as e:
-                st.error(lang['analysis_error'].format(error=str(e)))
-                st.session_state['analysis_result'] = {"error": str(e)}
+        try:
+            if not run_analysis(config):
+                st.warning(lang['no_input'])
+        except Exception as e:
+            st.error(lang['analysis_error'].format(error=str(e)))
+            st.session_state['analysis_result'] = AnalysisView(results=[], scorecard={}, error=str(e))
+
+    if collect_analysis(lang):
+        analysis_progress(lang)
 
     # Display results if available
     if 'analysis_result' in st.session_state:
-        result = st.session_state['analysis_result']
-        if isinstance(result, dict) and 'error' in result:
-            st.error(result['error'])
+        view = st.session_state['analysis_result']
+        if view.error is not None:
+            st.error(view.error)
         else:
             # Compute additional stats
-            results = result.get('results', []) if isinstance(result, dict) else []
-            total_tests = len(results)
-            run_tests = sum(1 for r in results if r.get('status') != 'skipped')
-            skipped_tests = total_tests - run_tests
-            failed_tests = sum(1 for r in results if not r.get('passed', True) and r.get('status') != 'skipped')
+            results = view.results
+            if results:
+                df, counts, p_numeric, option_labels = prepare_results(view.key, results, EXPECTED_COLUMNS)
+            else:
+                df, counts, p_numeric, option_labels = None, count_results(None), None, []
+            total_tests, run_tests, skipped_tests, failed_tests = counts
 
             # scorecard'ı st.metric ile göster
-            scorecard = result.get('scorecard', {}) if isinstance(result, dict) else {}
+            scorecard = view.scorecard
             if scorecard:
                 st.subheader(lang['scorecard'])
                 # Custom metrics
                 cols = st.columns(5)
                 cols[0].metric(lang['failed_tests'], f"{failed_tests} / {total_tests}")
-                cols[1].metric(lang['mean_effect_size'], format_val(scorecard.get('mean_effect_size', 'None')), help=lang.get('mean_effect_size_desc', ''))
-                cols[2].metric(lang['p_value_distribution'], format_val(scorecard.get('p_value_distribution', {}), max_len=40), help=lang.get('p_value_distribution_desc', ''))
+                mean_effect_str, p_dist_str = format_scorecard(view.key, scorecard)
+                cols[1].metric(lang['mean_effect_size'], mean_effect_str, help=lang.get('mean_effect_size_desc', ''))
+                cols[2].metric(lang['p_value_distribution'], p_dist_str, help=lang.get('p_value_distribution_desc', ''))
                 cols[3].metric(lang['run_tests'], run_tests)
                 cols[4].metric(lang['skipped_tests'], skipped_tests, help=lang.get('skipped_tests_desc', ''))
 
             if results:
                 st.subheader(lang['findings'])
-                df = pd.DataFrame(results)
-                # Reindex to include all possible columns
-                expected_columns = [
-                    'test_name', 'passed', 'p_value', 'p_values', 'effect_sizes', 'flags',
-                    'z_score', 'evidence', 'time_ms', 'bytes_processed', 'status',
-                    'fdr_rejected', 'fdr_q', 'visuals', 'reason', 'metrics'
-                ]
-                df = df.reindex(columns=expected_columns)
-                # Convert dict keys in metrics to str for Arrow compatibility
-                if 'metrics' in df.columns:
-                    df['metrics'] = df['metrics'].apply(lambda d: {str(k): v for k, v in d.items()} if isinstance(d, dict) else d)
-                if 'p_value' in df.columns:
-                    def _p_style(v):
-                        try:
-                            return 'background-color: red' if float(v) < fdr_q else ''
-                        except Exception:
-                            return ''
-                    styled = df.style.map(_p_style, subset=['p_value'])
-                    st.dataframe(styled, column_config={
-                        col: st.column_config.TextColumn(help=lang['column_explanations'].get(col, '')) for col in expected_columns
-                    })
-                else:
-                    st.dataframe(df, column_config={
-                        col: st.column_config.TextColumn(help=lang['column_explanations'].get(col, '')) for col in expected_columns
-                    })
-
-                # Select a result for details
-                option_labels = [f"{i} - {r.get('test_name', 'Unknown')}" for i, r in enumerate(results)]
-                selected_label = st.selectbox(lang['select_result'], options=option_labels)
-                if selected_label:
-                    selected_idx = int(selected_label.split(" - ")[0])
-                    selected_result = results[selected_idx]
-                    st.subheader(lang['selected_details'])
-                    st.json(selected_result)
-
-                    # Test-specific explanation
-                    test_name = selected_result.get('test_name')
-                    desc = lang['test_explanations'].get(test_name, "Açıklama yok." if st.session_state.language == "tr" else "No description.")
-                    st.write(f"**Test Açıklaması**: {desc}")
-
-                    # If skipped or error, show reason
-                    status = selected_result.get('status')
-                    if status == 'skipped' or status == 'error':
-                        reason = selected_result.get('reason', 'Bilinmeyen neden' if st.session_state.language == "tr" else 'Unknown reason')
-                        st.warning(f"Bu test {status} oldu. Neden: {reason}")
-
-                    # Visuals if any
-                    visuals = selected_result.get('visuals', {})
-                    if visuals:
-                        st.subheader(lang['visuals'])
-                        for vname, vdata in visuals.items():
-                            if isinstance(vdata, dict):
-                                if 'data_base64' in vdata:
-                                    try:
-                                        mime = vdata.get('mime', 'image/svg+xml')
-                                        base64_data = vdata['data_base64']
-                                        if mime == 'image/svg+xml':
-                                            # Display SVG using markdown
-                                            st.markdown(f'<img src="data:image/svg+xml;base64,{base64_data}" alt="{vname}">', unsafe_allow_html=True)
-                                        else:
-                                            img_data = base64.b64decode(base64_data)
-                                            st.image(img_data, caption=vname, use_container_width=True)
-                                    except Exception as e:
-                                        st.error(lang['visual_error'].format(name=vname, error=str(e)))
-                                elif 'path' in vdata:
-                                    try:
-                                        st.image(vdata['path'], caption=vname, use_container_width=True)
-                                    except Exception as e:
-                                        st.error(lang['visual_error'].format(name=vname, error=str(e)))
-                            else:
-                                st.write(lang['visual_format_error'].format(name=vname))
+                column_config = results_column_config(lang_code)
+                st.dataframe(findings_table(view.key, df, p_numeric, fdr_q), column_config=column_config)
+
+                # Selecting a result reruns only this fragment, not the sidebar/table
+                result_details(view, option_labels, lang, lang_code)
             else:
                 st.info(lang['no_results'])
 
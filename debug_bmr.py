@@ -1,28 +1,30 @@
+import numpy as np
+
 from patternanalyzer.plugin_api import BytesView
 from patternanalyzer.plugins.binary_matrix_rank import BinaryMatrixRankTest
 
 def inspect_rows(m=8, num_matrices=1):
+    """Return (bits, row_ints, bv, pattern) for the test pattern.
+
+    bits has shape (num_matrices, m, m) (MSB-first, like BytesView.bit_view());
+    row_ints holds each row read as a big-endian integer, shape (num_matrices, m).
+    Requires m <= 64.
+    """
     bits_per_matrix = m * m
     total_bytes = (bits_per_matrix * num_matrices) // 8
     pattern = (b'\xAA\x55') * (total_bytes // 2)
     bv = BytesView(pattern)
-    bits = bv.bit_view()
-    # Build rows for first matrix
-    mat_bits = bits[0:bits_per_matrix]
-    rows = []
-    for r in range(m):
-        row_bits = mat_bits[r*m:(r+1)*m]
-        val = 0
-        for bit in row_bits:
-            val = (val << 1) | (1 if bit else 0)
-        rows.append((row_bits, val))
-    return rows, bv, pattern
+    bits = np.unpackbits(np.frombuffer(pattern, dtype=np.uint8))
+    bits = bits[:bits_per_matrix * num_matrices].reshape(num_matrices, m, m)
+    weights = np.left_shift(np.uint64(1), np.arange(m - 1, -1, -1, dtype=np.uint64))
+    row_ints = bits.astype(np.uint64) @ weights
+    return bits, row_ints, bv, pattern
 
 def main():
     m = 8
-    rows, bv, pattern = inspect_rows(m=m, num_matrices=1)
+    bits, row_ints, bv, pattern = inspect_rows(m=m, num_matrices=1)
     print("First matrix rows (bits, int, bin):")
-    for i, (rb, val) in enumerate(rows):
+    for i, (rb, val) in enumerate(zip(bits[0].tolist(), row_ints[0].tolist())):
         print(f"row {i}: bits={rb} int={val} bin={format(val, '08b')}")
     # Run full plugin to show ranks
     res = BinaryMatrixRankTest().run(BytesView(pattern * 8), {"matrix_dim": m, "min_matrices": 8})
@@ -30,4 +32,4 @@ def main():
     print("ranks:", res.metrics.get("ranks"))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -11,9 +11,8 @@ e = Engine()
 e.register_test("obs_test", ObsTest())
 out = e.analyze(b"\x00\x01\x02", {"tests":[{"name":"obs_test","params":{}}]})
 print("analyze returned:", repr(out))
-import inspect, patternanalyzer.engine
-src = inspect.getsource(patternanalyzer.engine)
+import linecache, patternanalyzer.engine
+lines = linecache.getlines(patternanalyzer.engine.__file__)
 print("\n--- source slice 1000..1320 ---")
-for i, line in enumerate(src.splitlines(), start=1):
-    if 1000 <= i <= 1320:
-        print(f"{i:4d} | {line}")
\ No newline at end of file
+for i, line in enumerate(lines[999:1320], start=1000):
+    print(f"{i:4d} | {line.rstrip()}")
\ No newline at end of file
@@ -8,10 +8,25 @@ heuristic. Designed to be self-contained and imported by patternanalyzer.engine.
 from __future__ import annotations
 
 import base64
-import math
-from collections import Counter, defaultdict
+import binascii
+import functools
+import hashlib
+import heapq
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Dict, Any, List, Tuple, Optional
 
+import numpy as np
+
+try:
+    # Optional SIMD base64 codec; same API as the stdlib module
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    _b64decode = base64.b64decode
+
 from .plugin_api import BytesView
 
 
@@ -27,6 +42,39 @@ ENGLISH_FREQ = {
     "z": 0.00074, " ": 0.13000
 }
 
+# Bytes str.split() treats as whitespace in ASCII text
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+# Lookup tables for scoring all 256 single-byte XOR keys from one histogram.
+# The histogram of ``bts ^ k`` is the histogram of ``bts`` permuted by ``v ^ k``,
+# so row k of ``hist[_XOR_PERM]`` is the byte histogram of the key-k plaintext.
+_BYTE_VALUES = np.arange(256)
+_XOR_PERM = _BYTE_VALUES[:, None] ^ _BYTE_VALUES[None, :]
+# bts.translate(_XOR_TABLES[k]) is bts XOR k, done by a single C-level pass
+_XOR_TABLES = [row.tobytes() for row in _XOR_PERM.astype(np.uint8)]
+_PRINTABLE = ((_BYTE_VALUES >= 32) & (_BYTE_VALUES <= 126)) | np.isin(_BYTE_VALUES, (9, 10, 13))
+_PRINTABLE_COUNTS = _PRINTABLE.astype(np.int64)
+# deletechars for bytes.translate: what survives is the non-printable bytes
+_PRINTABLE_BYTES = np.flatnonzero(_PRINTABLE).astype(np.uint8).tobytes()
+# (256, 27) 0/1 matrix folding each byte onto its ENGLISH_FREQ symbol (case-insensitive)
+_ENGLISH_FOLD = np.zeros((256, len(ENGLISH_FREQ)))
+for _col, _ch in enumerate(ENGLISH_FREQ):
+    _ENGLISH_FOLD[ord(_ch), _col] = 1.0
+    _ENGLISH_FOLD[ord(_ch.upper()), _col] = 1.0
+_ENGLISH_EXPECTED = np.array(list(ENGLISH_FREQ.values()))
+# Key-major variant: hist @ _PRINTABLE_PERM gives the printable count for every
+# key (v ^ k is symmetric). A single histogram's chi only needs the 53 letter/space bins.
+_PRINTABLE_PERM = _PRINTABLE[_XOR_PERM].astype(np.float64)
+_FOLD_BYTES = np.flatnonzero(_ENGLISH_FOLD.any(axis=1))
+_FOLD_SUB = _ENGLISH_FOLD[_FOLD_BYTES]
+# Letters a/A differ only in bit 0x20, so after folding hist[v] + hist[v ^ 0x20]
+# one gathered bin per (key, symbol) is the symbol count: _SYMBOL_PERM[k, c]
+# indexes [folded hist | raw hist] (the raw half for space, which has no case).
+_CASE_SWAP = _BYTE_VALUES ^ 0x20
+_SYMBOL_PERM = np.stack(
+    [_XOR_PERM[:, ord(ch)] + (0 if ch.isalpha() else 256) for ch in ENGLISH_FREQ], axis=1
+)
+
 
 def to_bytes(bv: BytesView) -> bytes:
     try:
@@ -35,103 +83,144 @@ def to_bytes(bv: BytesView) -> bytes:
         return bytes(bv.data)
 
 
-def shannon_entropy(bts: bytes) -> float:
+# The scorers below all derive from the 256-bin byte histogram; callers that
+# score the same bytes several ways pass ``hist`` so the bytes are counted once.
+
+
+def shannon_entropy(bts: bytes, hist: Optional[np.ndarray] = None) -> float:
     if not bts:
         return 0.0
-    freqs = Counter(bts)
-    ent = 0.0
-    ln = len(bts)
-    for v in freqs.values():
-        p = v / ln
-        ent -= p * math.log2(p)
-    return ent
+    return _histogram_entropy(_byte_histogram(bts) if hist is None else hist, len(bts))
 
 
-def printable_ratio(bts: bytes) -> float:
+def printable_ratio(bts: bytes, hist: Optional[np.ndarray] = None) -> float:
     if not bts:
         return 0.0
-    good = 0
-    for c in bts:
-        if 32 <= c <= 126 or c in (9, 10, 13):
-            good += 1
-    return good / len(bts)
+    if hist is None:
+        # Table-driven count in one C pass; no histogram needed
+        return (len(bts) - len(bytes(bts).translate(None, _PRINTABLE_BYTES))) / len(bts)
+    return _histogram_printable(hist, len(bts))
 
 
-def index_of_coincidence(bts: bytes) -> float:
+def index_of_coincidence(bts: bytes, hist: Optional[np.ndarray] = None) -> float:
     n = len(bts)
     if n <= 1:
         return 0.0
-    freqs = Counter(bts)
-    s = 0
-    for v in freqs.values():
-        s += v * (v - 1)
-    return s / (n * (n - 1))
+    return _histogram_ioc(_byte_histogram(bts) if hist is None else hist, n)
+
+
+def _byte_histogram(bts: bytes) -> np.ndarray:
+    return np.bincount(np.frombuffer(bts, dtype=np.uint8), minlength=256)
+
+
+def _xor_key_scores(hist: np.ndarray, n) -> Tuple[np.ndarray, np.ndarray]:
+    """Score every single-byte XOR key from the ciphertext histogram alone.
+
+    Returns ``(printable_ratio, chi)`` arrays indexed by key (last axis), matching
+    printable_ratio() and english_chi_squared_score() of ``bts ^ k``. ``hist``
+    may stack several histograms, e.g. ``(buckets, 256)`` with ``n`` of shape
+    ``(buckets, 1)``.
+    """
+    pr = (hist @ _PRINTABLE_PERM) / n
+    return pr, _chi_from_counts(_xor_symbol_counts(hist), n)
+
+
+def _xor_symbol_counts(hist: np.ndarray, keys=slice(None)) -> np.ndarray:
+    """Per-key ENGLISH_FREQ symbol counts of ``bts ^ k``: shape (..., len(keys), 27)."""
+    src = np.concatenate((hist + hist[..., _CASE_SWAP], hist), axis=-1)
+    return src[..., _SYMBOL_PERM[keys]]
+
+
+def _chi_from_counts(obs: np.ndarray, n):
+    expected = _ENGLISH_EXPECTED * np.expand_dims(n, -1)
+    # one float temporary, squared and scaled in place
+    dev = obs - expected
+    np.square(dev, out=dev)
+    dev /= expected
+    # normalize by total to make score comparable across lengths
+    return dev.sum(axis=-1) / n
+
+
+def _histogram_chi(hist: np.ndarray, n: int):
+    """English chi-squared score (see english_chi_squared_score) from a histogram."""
+    return _chi_from_counts(hist[_FOLD_BYTES] @ _FOLD_SUB, n)
+
+
+def _histogram_entropy(hist: np.ndarray, n: int) -> float:
+    p = hist[hist > 0] / n
+    return float(-(p * np.log2(p)).sum())
+
+
+def _histogram_printable(hist: np.ndarray, n: int) -> float:
+    return float(hist @ _PRINTABLE_COUNTS) / n
+
 
+def _histogram_ioc(hist: np.ndarray, n: int) -> float:
+    return float((hist * (hist - 1)).sum()) / (n * (n - 1))
 
-def english_chi_squared_score(bts: bytes) -> float:
+
+def _histogram_stats(hist: np.ndarray, n: int) -> Tuple[float, float, float, float]:
+    """Return (printable_ratio, entropy, IoC, chi) of non-empty data from its histogram.
+
+    Fuses the four scorers so a candidate's bytes are traversed once (by
+    np.bincount) instead of once per scorer.
+    """
+    ioc = _histogram_ioc(hist, n) if n > 1 else 0.0
+    return _histogram_printable(hist, n), _histogram_entropy(hist, n), ioc, float(_histogram_chi(hist, n))
+
+
+def english_chi_squared_score(bts: bytes, hist: Optional[np.ndarray] = None) -> float:
     """Compute a chi-squared style score against English letter+space frequencies.
 
     Lower is better (0 = perfect match). Non-letter bytes are counted as mismatch.
     """
     if not bts:
         return float("inf")
-    cts = Counter()
-    total = 0
-    for b in bts:
-        ch = chr(b).lower() if 0x20 <= b <= 0x7E else None
-        if ch and (ch.isalpha() or ch == " "):
-            cts[ch] += 1
-        else:
-            # count as a mismatch by leaving it out but increasing total
-            pass
-        total += 1
-    if total == 0:
-        return float("inf")
-    chi = 0.0
-    for ch, exp in ENGLISH_FREQ.items():
-        obs = cts.get(ch, 0)
-        expected = exp * total
-        # avoid division by zero for extremely small expected
-        if expected > 0:
-            chi += ((obs - expected) ** 2) / expected
-    # normalize by total to make score comparable across lengths
-    return chi / total
+    # Non-letter bytes fall outside every folded column but still count in total
+    return float(_histogram_chi(_byte_histogram(bts) if hist is None else hist, len(bts)))
 
 
 # --- Kasiski / key-length heuristics ------------------------------------------
 
 
+def _bucket_histograms(arr: np.ndarray, k: int) -> np.ndarray:
+    """Byte histograms of the interleaved buckets ``arr[i::k]`` as a (min(k, n), 256) array.
+
+    One bincount over ``(pos % k) * 256 + byte`` replaces k slices.
+    """
+    nb = min(k, arr.size)
+    slot = (np.arange(arr.size) % k) * 256 + arr
+    return np.bincount(slot, minlength=nb * 256).reshape(nb, 256)
+
+
 def kasiski_candidates(bts: bytes, max_keylen: int = 40) -> List[int]:
     """Simple Kasiski-like examination: find repeated 3..5 byte sequences and
     return common gcds of distances as candidate key lengths.
     """
     if len(bts) < 10:
         return []
-    ngram_lens = (3, 4, 5)
-    distances = []
-    for n in ngram_lens:
-        seen = {}
-        for i in range(len(bts) - n + 1):
-            ng = bts[i : i + n]
-            if ng in seen:
-                # record distance to previous occurrence(s)
-                for j in seen[ng]:
-                    distances.append(i - j)
-                seen[ng].append(i)
-            else:
-                seen[ng] = [i]
-    # compute gcds frequency
-    gcd_counts = Counter()
-    from math import gcd
-
-    for d in distances:
-        for k in range(2, min(max_keylen, d) + 1):
-            if d % k == 0:
-                gcd_counts[k] += 1
-    if not gcd_counts:
-        return []
+    arr = np.frombuffer(bts, dtype=np.uint8).astype(np.uint64)
+    # counts[k]: number of repeat distances (any pair of equal n-grams) divisible by k
+    counts = np.zeros(max(max_keylen, 1) + 1, dtype=np.int64)
+    for n in (3, 4, 5):
+        m = arr.size - n + 1
+        # Pack each n-byte window into one integer (exact for n <= 8, no hashing)
+        win = arr[:m].copy()
+        for j in range(1, n):
+            win = (win << np.uint64(8)) | arr[j:j + m]
+        _, inverse, occurrences = np.unique(win, return_inverse=True, return_counts=True)
+        repeated = occurrences[inverse] > 1
+        if not repeated.any():
+            continue
+        pos = np.flatnonzero(repeated)
+        _, group = np.unique(win[pos], return_inverse=True)
+        # k divides a distance iff both positions share a residue mod k, so the
+        # divisible pairs of a group are C(c, 2) summed over its residue classes
+        for k in range(2, max_keylen + 1):
+            c = np.bincount(group * k + pos % k)
+            counts[k] += int((c * (c - 1) // 2).sum())
     # return top 6 candidates sorted by count then by small keylen
-    items = sorted(gcd_counts.items(), key=lambda x: (-x[1], x[0]))
+    items = sorted(((k, int(counts[k])) for k in range(2, max_keylen + 1) if counts[k]), key=lambda x: (-x[1], x[0]))
     return [k for k, _ in items[:6]]
 
 
@@ -141,18 +230,17 @@ def ioc_keylen_candidates(bts: bytes, max_keylen: int = 40, topn: int = 6) -> Li
     """
     if len(bts) < 10:
         return []
+    arr = np.frombuffer(bts, dtype=np.uint8)
     scores = []
+    # k <= len/2, so every bucket holds at least two bytes
     for k in range(1, min(max_keylen, len(bts) // 2) + 1):
-        buckets = [bytearray() for _ in range(k)]
-        for i, b in enumerate(bts):
-            buckets[i % k].append(b)
-        avg_ioc = 0.0
-        for bucket in buckets:
-            avg_ioc += index_of_coincidence(bytes(bucket))
-        avg_ioc /= k
+        hist = _bucket_histograms(arr, k)
+        sizes = hist.sum(axis=1)
+        iocs = (hist * (hist - 1)).sum(axis=1) / (sizes * (sizes - 1))
+        # Python-level sum keeps the former left-to-right accumulation order
+        avg_ioc = sum(iocs.tolist()) / k
         scores.append((k, avg_ioc))
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return [k for k, _ in scores[:topn]]
+    return [k for k, _ in heapq.nlargest(topn, scores, key=lambda x: x[1])]
 
 
 # --- Repeating-key XOR key estimation -----------------------------------------
@@ -163,29 +251,68 @@ def estimate_repeating_xor_key(bts: bytes, keylen: int) -> Tuple[bytes, float]:
     single-byte XOR and selecting the byte which yields best English match.
     Returns (key_bytes, aggregated_score) where higher aggregated_score is better.
     """
-    key = bytearray(keylen)
-    bucket_scores = []
-    for i in range(keylen):
-        bucket = bytes(bts[i::keylen])
-        best_score = None
-        best_k = 0
-        # For speed, we can restrict to 0..255 but score quickly; it's acceptable here.
-        for k in range(256):
-            dec = bytes([b ^ k for b in bucket])
-            # scoring: printable ratio + normalized negative chi (lower chi better)
-            pr = printable_ratio(dec)
-            chi = english_chi_squared_score(dec)
-            # Convert chi to a positive reward (smaller chi => larger reward)
-            reward = pr * 1.0 + (1.0 / (1.0 + chi)) * 1.0
-            if best_score is None or reward > best_score:
-                best_score = reward
-                best_k = k
-        key[i] = best_k
-        # record normalized bucket quality (best_score)
-        bucket_scores.append(best_score or 0.0)
-    # aggregated score: mean of bucket scores
-    agg = sum(bucket_scores) / len(bucket_scores) if bucket_scores else 0.0
-    return bytes(key), agg
+    return estimate_repeating_xor_keys(bts, [keylen])[0]
+
+
+def estimate_repeating_xor_keys(bts: bytes, keylens: List[int]) -> List[Tuple[bytes, float]]:
+    """estimate_repeating_xor_key for several key lengths at once.
+
+    The buckets of every key length are stacked into one histogram array and
+    scored against all 256 keys in a single batch. Histograms are filled one
+    key length at a time, so scratch memory stays O(len(bts)) however many
+    lengths are requested.
+    """
+    arr = np.frombuffer(bts, dtype=np.uint8)
+    # Buckets past the input length are empty: key byte 0, zero quality
+    rows = [min(k, arr.size) for k in keylens]
+    offsets = [0]
+    for r in rows:
+        offsets.append(offsets[-1] + r)
+    best = best_rewards = None
+    if offsets[-1]:
+        pos = np.arange(arr.size)
+        # One reused slot buffer: (position mod k) * 256 + byte, bincounted into
+        # this key length's rows of the shared histogram
+        slots = np.empty(arr.size, dtype=np.intp)
+        hist = np.empty((offsets[-1], 256), dtype=np.int64)
+        for k, off, r in zip(keylens, offsets, rows):
+            if not r:
+                continue
+            np.remainder(pos, k, out=slots)
+            slots *= 256
+            slots += arr
+            hist[off:off + r] = np.bincount(slots, minlength=r * 256).reshape(r, 256)
+        # Score all (bucket, key) pairs at once (no decrypted copies)
+        pr, chi = _xor_key_scores(hist, hist.sum(axis=1, keepdims=True))
+        # scoring: printable ratio + normalized negative chi (lower chi better)
+        # Convert chi to a positive reward (smaller chi => larger reward)
+        rewards = pr * 1.0 + (1.0 / (1.0 + chi)) * 1.0
+        # argmax returns the first maximum, i.e. the smallest key on ties
+        best = rewards.argmax(axis=1)
+        best_rewards = rewards[np.arange(offsets[-1]), best]
+    out = []
+    for k, off, r in zip(keylens, offsets, rows):
+        key = bytearray(k)
+        bucket_scores = [0.0] * k
+        if r:
+            key[:r] = best[off:off + r].astype(np.uint8).tobytes()
+            # record normalized bucket quality (best_score)
+            bucket_scores[:r] = best_rewards[off:off + r].tolist()
+        # aggregated score: mean of bucket scores
+        agg = sum(bucket_scores) / len(bucket_scores) if bucket_scores else 0.0
+        out.append((bytes(key), agg))
+    return out
+
+
+def _repeating_xor(bts: bytes, key: bytes, arr: Optional[np.ndarray] = None) -> bytes:
+    """XOR ``bts`` with ``key`` repeated over its length (``arr``: optional uint8 view of bts)."""
+    if not key:
+        return bytes(bts)
+    if len(key) == 1:
+        return bytes(bts).translate(_XOR_TABLES[key[0]])
+    if arr is None:
+        arr = np.frombuffer(bts, dtype=np.uint8)
+    return (arr ^ np.resize(np.frombuffer(key, dtype=np.uint8), arr.size)).tobytes()
 
 
 # --- Transforms applied during beam search -----------------------------------
@@ -197,36 +324,59 @@ def try_base64_decode(bts: bytes) -> Optional[bytes]:
     txt = bts.strip()
     if len(txt) < 8:
         return None
-    # quick character-set check (base64 charset)
+    # remove common whitespace; b64decode(validate=True) rejects anything else
+    # outside the base64 alphabet (including non-ASCII) in C
+    cand = txt.translate(None, _ASCII_WHITESPACE)
     try:
-        txt_str = txt.decode("ascii")
-    except Exception:
-        return None
-    # remove common whitespace
-    cand = "".join(txt_str.split())
-    # valid base64 chars
-    import re
+        dec = _b64decode(cand, validate=True)
+    except binascii.Error:
+        # pybase64 rejects surplus trailing '=' that the stdlib decoder accepts;
+        # retry those with the stdlib so results don't depend on the extra
+        if _b64decode is base64.b64decode or not cand.endswith(b"="):
+            return None
+        try:
+            dec = base64.b64decode(cand, validate=True)
+        except binascii.Error:
+            return None
+    return dec or None
 
-    if not re.fullmatch(r"[A-Za-z0-9+/=]+", cand):
-        return None
-    try:
-        dec = base64.b64decode(cand, validate=True)
-        if dec:
-            return dec
-    except Exception:
-        return None
-    return None
 
+def apply_single_byte_xor_candidates(bts: bytes, top_n: int = 8,
+                                     hist: Optional[np.ndarray] = None) -> List[Tuple[int, bytes, float]]:
+    """Return top_n single-byte-xor key candidates sorted by heuristic score.
 
-def apply_single_byte_xor_candidates(bts: bytes, top_n: int = 8) -> List[Tuple[int, bytes, float]]:
-    """Return top_n single-byte-xor key candidates sorted by heuristic score."""
-    scored = []
-    for k in range(256):
-        dec = bytes([c ^ k for c in bts])
-        score = (printable_ratio(dec) * 1.5) - (shannon_entropy(dec) / 8.0) - (english_chi_squared_score(dec) * 0.01)
-        scored.append((k, dec, score))
-    scored.sort(key=lambda x: x[2], reverse=True)
-    return scored[:top_n]
+    ``hist`` may pass in an already computed byte histogram of ``bts``.
+    """
+    if not bts:
+        return [(k, b"", float("-inf")) for k in range(min(top_n, 256))]
+    n = len(bts)
+    if hist is None:
+        hist = _byte_histogram(bts)
+    # XOR only permutes the histogram, so entropy is the same for every key
+    ent_term = _histogram_entropy(hist, n) / 8.0
+    # Printable ratio of every key is one matmul; chi is the costly part
+    pr = (hist @ _PRINTABLE_PERM) / n
+    # chi >= 0, so 1.5 * pr - ent_term bounds each key's score from above
+    bound = (pr * 1.5) - ent_term
+    keys = _BYTE_VALUES
+    if 0 < top_n * 4 < 256:
+        # Fully score only the most printable keys, then any other key whose
+        # bound can still reach the top_n-th score (keeps the result exact)
+        keys = np.sort(np.argpartition(-pr, top_n * 4)[:top_n * 4])
+        scores = bound[keys] - (_chi_from_counts(_xor_symbol_counts(hist, keys), n) * 0.01)
+        threshold = np.partition(scores, -top_n)[-top_n]
+        rest = np.setdiff1d(np.flatnonzero(bound >= threshold), keys)
+        if rest.size:
+            keys = np.concatenate((keys, rest))
+            scores = np.concatenate((scores, bound[rest] - (_chi_from_counts(_xor_symbol_counts(hist, rest), n) * 0.01)))
+            by_key = np.argsort(keys)
+            keys, scores = keys[by_key], scores[by_key]
+    else:
+        scores = bound - (_chi_from_counts(_xor_symbol_counts(hist), n) * 0.01)
+    # stable: ties keep ascending key order, like the former list.sort
+    order = np.argsort(-scores, kind="stable")[:top_n]
+    bts = bytes(bts)  # no-op for bytes; translate is a bytes method
+    return [(int(keys[i]), bts.translate(_XOR_TABLES[keys[i]]), float(scores[i])) for i in order]
 
 
 # --- Beam search core ---------------------------------------------------------
@@ -236,10 +386,10 @@ def _score_plaintext_candidate(bts: bytes) -> float:
     """Aggregate heuristic score for a candidate plaintext (higher is better)."""
     if not bts:
         return -999.0
-    pr = printable_ratio(bts)
-    ent = shannon_entropy(bts)
-    ioc = index_of_coincidence(bts)
-    chi = english_chi_squared_score(bts)
+    return _score_from_stats(*_histogram_stats(_byte_histogram(bts), len(bts)))
+
+
+def _score_from_stats(pr: float, ent: float, ioc: float, chi: float) -> float:
     # Normalize IoC around English expected ~0.065
     ioc_score = max(0.0, (ioc - 0.03))  # favor above noise baseline
     # Combine heuristics with tuned weights
@@ -247,6 +397,147 @@ def _score_plaintext_candidate(bts: bytes) -> float:
     return score
 
 
+# IoC gates for the repeating-XOR key length search: English text sits near
+# 0.066, so above _IOC_PLAINTEXT a node is already plaintext-like; below
+# _IOC_UNIFORM (uniform bytes give 1/256) a long buffer is close to random.
+_IOC_PLAINTEXT = 0.055
+_IOC_UNIFORM = 0.01
+_IOC_UNIFORM_MIN_LEN = 4096
+
+
+@dataclass(eq=False)
+class BeamCtx:
+    """Bytes of a beam node plus derived data, each computed lazily at most once.
+
+    Producers that already know the histogram (e.g. a single-byte XOR of a
+    parent, whose histogram is a permutation of the parent's) pass it in.
+    """
+    bts: bytes
+    hist: Optional[np.ndarray] = None
+    keylens: Optional[List[int]] = field(default=None, repr=False)
+    transforms: Optional[list] = field(default=None, repr=False)
+
+    @cached_property
+    def arr(self) -> np.ndarray:
+        # uint8 view shared by the vectorized transforms (no copy)
+        return np.frombuffer(self.bts, dtype=np.uint8)
+
+    def histogram(self) -> np.ndarray:
+        if self.hist is None:
+            self.hist = np.bincount(self.arr, minlength=256)
+        return self.hist
+
+    @cached_property
+    def stats(self) -> Tuple[float, float, float, float]:
+        """(printable_ratio, entropy, IoC, chi) of the bytes."""
+        if not self.bts:
+            return 0.0, 0.0, 0.0, float("inf")
+        return _histogram_stats(self.histogram(), len(self.bts))
+
+    @cached_property
+    def score(self) -> float:
+        """Same value as _score_plaintext_candidate(bts)."""
+        if not self.bts:
+            return -999.0
+        return _score_from_stats(*self.stats)
+
+    def keylen_candidates(self, max_keylen: int) -> List[int]:
+        """Repeating-XOR key lengths to try: Kasiski + IoC ranking, then 1..4, at most 6.
+
+        Gated on the node's IoC: text-like bytes only get length 1 (no key
+        length search), and large near-uniform bytes only their top 2 lengths.
+        """
+        if self.keylens is None:
+            ioc = self.stats[2]
+            if ioc > _IOC_PLAINTEXT:
+                self.keylens = [1]
+                return self.keylens
+            k_candidates = []
+            ks1 = kasiski_candidates(self.bts, max_keylen)
+            ks2 = ioc_keylen_candidates(self.bts, max_keylen)
+            for k in ks1 + ks2:
+                if 1 <= k <= max_keylen and k not in k_candidates:
+                    k_candidates.append(k)
+            # Always include small lengths 1..4 as fallback
+            for k in range(1, min(5, max_keylen + 1)):
+                if k not in k_candidates:
+                    k_candidates.append(k)
+            # Limit number of lengths to attempt per node
+            limit = 2 if ioc < _IOC_UNIFORM and len(self.bts) > _IOC_UNIFORM_MIN_LEN else 6
+            self.keylens = k_candidates[:limit]
+        return self.keylens
+
+
+# Beam nodes: tuple (score, chain, ctx, metadata)
+# chain: list of transform dicts {"name":..., "params": {...}}
+BeamNode = Tuple[float, List[Dict[str, Any]], BeamCtx, Dict[str, Any]]
+
+
+def _ctx_for(contexts: Dict[bytes, BeamCtx], bts: bytes, hist: Optional[np.ndarray] = None) -> BeamCtx:
+    """Return the search-wide BeamCtx for ``bts``, so equal bytes reached via
+    different chains share their derived data and transforms."""
+    ctx = contexts.get(bts)
+    if ctx is None:
+        ctx = contexts.setdefault(bts, BeamCtx(bts, hist=hist))
+    return ctx
+
+
+def _node_transforms(ctx: BeamCtx, max_keylen: int, contexts: Dict[bytes, BeamCtx]) -> List[Tuple[Dict[str, Any], BeamCtx, float, Dict[str, Any]]]:
+    """(transform step, child ctx, child score, metadata) for every transform of
+    ``ctx``; computed once per distinct input and memoized on the ctx."""
+    if ctx.transforms is not None:
+        return ctx.transforms
+    bts = ctx.bts
+    out = []
+    # 1) Try base64 decode (if applicable)
+    dec = try_base64_decode(bts)
+    if dec is not None:
+        dec_ctx = _ctx_for(contexts, dec)
+        out.append(({"name": "base64_decode", "params": {}}, dec_ctx, dec_ctx.score, {"method": "base64_decode"}))
+
+    # 2) Try repeating-key-XOR candidates:
+    #   - Kasiski and IoC-based key lengths, computed once per node
+    keylens = ctx.keylen_candidates(max_keylen)
+    for klen, (key_bytes, kval) in zip(keylens, estimate_repeating_xor_keys(bts, keylens)):
+        # apply transform
+        dec_ctx = _ctx_for(contexts, _repeating_xor(bts, key_bytes, ctx.arr))
+        step = {"name": "xor_repeating", "params": {"key_hex": key_bytes.hex(), "key_len": klen}}
+        nm = {"method": "xor_repeating", "key_len": klen, "key_score": kval}
+        # boost score a bit if key estimation confidence high
+        out.append((step, dec_ctx, dec_ctx.score + kval * 1.5, nm))
+
+    # 3) Try single-byte XOR top candidates (lightweight)
+    hist = ctx.histogram()
+    single_cands = apply_single_byte_xor_candidates(bts, top_n=6, hist=hist)
+    for k, dec_bytes, sscore in single_cands:
+        # XOR permutes the histogram: no need to recount the decrypted bytes
+        dec_ctx = _ctx_for(contexts, dec_bytes, hist=hist[_XOR_PERM[k]])
+        out.append(({"name": "xor_const", "params": {"xor_value": int(k)}}, dec_ctx, dec_ctx.score, {"method": "xor_const", "key": k}))
+    ctx.transforms = out
+    return out
+
+
+def _expand_node(node: BeamNode, max_keylen: int, contexts: Dict[bytes, BeamCtx]) -> List[BeamNode]:
+    """Return the child nodes of one beam node (independent of the other nodes)."""
+    score, chain, ctx, meta = node
+    # fresh dicts per chain: memoized transforms may be shared by several nodes
+    return [
+        (sc, chain + [{"name": step["name"], "params": dict(step["params"])}], child, dict(nm))
+        for step, child, sc, nm in _node_transforms(ctx, max_keylen, contexts)
+    ]
+
+
+def _expand_node_mp(args: Tuple[BeamNode, int]) -> List[BeamNode]:
+    """Process-pool entry point: expand one node with a worker-local memo."""
+    node, max_keylen = args
+    return _expand_node(node, max_keylen, {})
+
+
+def _chain_key(chain: List[Dict[str, Any]]) -> tuple:
+    """Hashable text representation of a transform chain, used for deduplication."""
+    return tuple((t["name"], tuple(sorted((k, str(v)) for k, v in t.get("params", {}).items()))) for t in chain)
+
+
 def beam_search_discover(data: BytesView, config: Dict[str, Any]) -> Dict[str, Any]:
     """Main entry: perform a shallow beam search over transform chains.
 
@@ -255,6 +546,11 @@ def beam_search_discover(data: BytesView, config: Dict[str, Any]) -> Dict[str, A
       - discover_max_depth (int): max transform chain length (default 3)
       - discover_top_k (int): how many final candidates to return (default 5)
       - discover_max_keylen (int): max key length to try for repeating-xor (default 40)
+      - discover_workers (int): workers expanding beam nodes in parallel
+        (default min(beam width, CPU count); 1 expands sequentially)
+      - discover_executor (str): "thread" (default) or "process"; processes
+        sidestep the GIL for the pure-Python paths, but each worker memoizes
+        transforms on its own and nodes are pickled across
     """
     raw = to_bytes(data)
     beam_width = int(config.get("discover_beam_width", 10))
@@ -262,86 +558,72 @@ def beam_search_discover(data: BytesView, config: Dict[str, Any]) -> Dict[str, A
     top_k = int(config.get("discover_top_k", 5))
     max_keylen = int(config.get("discover_max_keylen", 40))
     preview_len = int(config.get("discover_preview_len", 200))
+    workers = int(config.get("discover_workers", min(beam_width, os.cpu_count() or 1)))
+    use_processes = str(config.get("discover_executor", "thread")).lower() == "process"
 
-    # Beam nodes: tuple (score, chain, bytes, metadata)
-    # chain: list of transform dicts {"name":..., "params": {...}}
-    BeamNode = Tuple[float, List[Dict[str, Any]], bytes, Dict[str, Any]]
+    # One BeamCtx per distinct byte string seen during this search
+    contexts: Dict[bytes, BeamCtx] = {}
 
     # Initial node
-    init_score = _score_plaintext_candidate(raw)
-    beam: List[BeamNode] = [(init_score, [], raw, {"method": "raw"})]
+    init_ctx = _ctx_for(contexts, raw)
+    beam: List[BeamNode] = [(init_ctx.score, [], init_ctx, {"method": "raw"})]
 
     final_candidates: List[BeamNode] = []
 
-    for depth in range(1, max_depth + 1):
-        next_beam: List[BeamNode] = []
-        for score, chain, bts, meta in beam:
-            # 1) Try base64 decode (if applicable)
-            dec = try_base64_decode(bts)
-            if dec is not None:
-                ch = chain + [{"name": "base64_decode", "params": {}}]
-                sc = _score_plaintext_candidate(dec)
-                nm = {"method": "base64_decode"}
-                next_beam.append((sc, ch, dec, nm))
-
-            # 2) Try repeating-key-XOR candidates:
-            #   - compute Kasiski candidates and IoC-based candidates then unique them
-            k_candidates = []
-            ks1 = kasiski_candidates(bts, max_keylen)
-            ks2 = ioc_keylen_candidates(bts, max_keylen)
-            for k in ks1 + ks2:
-                if 1 <= k <= max_keylen and k not in k_candidates:
-                    k_candidates.append(k)
-            # Always include small lengths 1..4 as fallback
-            for k in range(1, min(5, max_keylen + 1)):
-                if k not in k_candidates:
-                    k_candidates.append(k)
-            # Limit number of lengths to attempt per node
-            k_candidates = k_candidates[:6]
-
-            for klen in k_candidates:
-                key_bytes, kval = estimate_repeating_xor_key(bts, klen)
-                # apply transform
-                decoded = bytes([cb ^ key_bytes[i % klen] for i, cb in enumerate(bts)])
-                ch = chain + [{"name": "xor_repeating", "params": {"key_hex": key_bytes.hex(), "key_len": klen}}]
-                sc = _score_plaintext_candidate(decoded)
-                nm = {"method": "xor_repeating", "key_len": klen, "key_score": kval}
-                # boost score a bit if key estimation confidence high
-                sc += kval * 1.5
-                next_beam.append((sc, ch, decoded, nm))
-
-            # 3) Try single-byte XOR top candidates (lightweight)
-            single_cands = apply_single_byte_xor_candidates(bts, top_n=6)
-            for k, dec_bytes, sscore in single_cands:
-                ch = chain + [{"name": "xor_const", "params": {"xor_value": int(k)}}]
-                sc = _score_plaintext_candidate(dec_bytes)
-                nm = {"method": "xor_const", "key": k}
-                next_beam.append((sc, ch, dec_bytes, nm))
-
-        # Merge and prune to beam_width
-        if not next_beam:
-            break
-        next_beam.sort(key=lambda x: x[0], reverse=True)
-        beam = next_beam[:beam_width]
-
-        # Collect promising nodes as final candidates (we can also collect at each depth)
-        for node in beam:
-            final_candidates.append(node)
+    # Nodes expand independently and the NumPy kernels release the GIL;
+    # map() keeps the children in beam order so results stay deterministic.
+    executor = None
+    if workers > 1:
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        executor = pool_cls(max_workers=workers)
+    try:
+        for depth in range(1, max_depth + 1):
+            if executor is not None and len(beam) > 1 and use_processes:
+                expanded = executor.map(_expand_node_mp, [(node, max_keylen) for node in beam])
+                # children come back as copies; re-intern them so later depths share contexts
+                expanded = [
+                    [(sc, chain, contexts.setdefault(ctx.bts, ctx), nm) for sc, chain, ctx, nm in children]
+                    for children in expanded
+                ]
+            else:
+                expand = functools.partial(_expand_node, max_keylen=max_keylen, contexts=contexts)
+                if executor is not None and len(beam) > 1:
+                    expanded = executor.map(expand, beam)
+                else:
+                    expanded = map(expand, beam)
+            next_beam: List[BeamNode] = [child for children in expanded for child in children]
+
+            # Merge and prune to beam_width
+            if not next_beam:
+                break
+            # nlargest matches sorted(reverse=True)[:n], ties included
+            beam = heapq.nlargest(beam_width, next_beam, key=lambda x: x[0])
+
+            # Collect promising nodes as final candidates (we can also collect at each depth)
+            for node in beam:
+                final_candidates.append(node)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
 
     # Post-process final_candidates and return top_k unique chains
     # Deduplicate by chain text representation
     seen = set()
     out = []
-    final_candidates.sort(key=lambda x: x[0], reverse=True)
-    for sc, chain, bts, meta in final_candidates:
-        key = tuple((t["name"], tuple(sorted((k, str(v)) for k, v in t.get("params", {}).items()))) for t in chain)
+    # Only the best few are needed; rank fully only if duplicates exhaust them
+    ranked = heapq.nlargest(max(top_k, 1) * 4, final_candidates, key=lambda x: x[0])
+    if len(ranked) < len(final_candidates) and len({_chain_key(node[1]) for node in ranked}) < top_k:
+        ranked = sorted(final_candidates, key=lambda x: x[0], reverse=True)
+    for sc, chain, ctx, meta in ranked:
+        bts = ctx.bts
+        key = _chain_key(chain)
         if key in seen:
             continue
         seen.add(key)
         # prepare preview
         preview = None
         try:
-            if printable_ratio(bts) >= 0.6:
+            if ctx.stats[0] >= 0.6:
                 preview = bts.decode("utf-8", errors="replace")[:preview_len]
             else:
                 preview = bts[:preview_len].hex()
@@ -370,8 +652,8 @@ def beam_search_discover(data: BytesView, config: Dict[str, Any]) -> Dict[str, A
     # Minimal engine-compatible wrapper
     metainfo = {}
     try:
-        import hashlib
-        metainfo["input_hash"] = hashlib.sha256(raw).hexdigest()
+        # Cached on the view, so the engine's fallback discovery reuses it
+        metainfo["input_hash"] = data.sha256_hex() if isinstance(data, BytesView) else hashlib.sha256(raw).hexdigest()
     except Exception:
         metainfo["input_hash"] = None
 
@@ -1,7 +1,9 @@
 """Pattern Analyzer analysis engine."""
  
+import collections.abc
+import importlib
 import importlib.metadata
-from typing import Dict, Any, List, Tuple
+from typing import Callable, Dict, Any, List, Tuple
 from .plugin_api import BytesView, TestResult, TransformPlugin, TestPlugin, VisualPlugin, serialize_testresult
 import base64
 import uuid
@@ -14,33 +16,225 @@ import datetime
 import sys
 import platform
 import hashlib
+import functools
 import concurrent.futures
-import logging
 import threading
+import contextlib
+import logging
+import logging.handlers
+import atexit
+import copy
+import gc
+import pickle
+import queue
+import traceback
 import subprocess
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
 # discovery helpers (beam-search, Kasiski, IoC, repeating-XOR estimation)
 from . import discovery
+
+try:
+    # Optional faster JSON parser for sandbox runner output; same results as json.loads
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    # Optional faster JSON encoder for the JSONL log handler
+    from orjson import dumps as _json_dumps_bytes
+except ImportError:
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+# _beam_discover sweep tables: row k marks the byte values that are printable
+# after XOR k / ROT-dec k / ROT-enc k, so table @ histogram counts printables.
+_BEAM_BYTES = np.arange(256)
+_BEAM_PRINTABLE = ((_BEAM_BYTES >= 32) & (_BEAM_BYTES <= 126)) | np.isin(_BEAM_BYTES, (9, 10, 13))
+_BEAM_XOR_PRINTABLE = _BEAM_PRINTABLE[_BEAM_BYTES[:, None] ^ _BEAM_BYTES].astype(np.int64)
+_BEAM_SUB_PRINTABLE = _BEAM_PRINTABLE[(_BEAM_BYTES - _BEAM_BYTES[:, None]) & 0xFF].astype(np.int64)
+_BEAM_ADD_PRINTABLE = _BEAM_PRINTABLE[(_BEAM_BYTES + _BEAM_BYTES[:, None]) & 0xFF].astype(np.int64)
  
  
+@functools.lru_cache(maxsize=None)
+def _cached_entry_points(group: str) -> tuple:
+    """Entry points declared for ``group``, without loading them.
+
+    Scanning installed distributions' metadata is the dominant Engine start-up
+    cost, so it happens once per process.
+    """
+    return tuple(importlib.metadata.entry_points(group=group))
+
+
+@functools.lru_cache(maxsize=None)
+def _entry_point_classes(group: str) -> Tuple[Tuple[str, Any], ...]:
+    """(name, loaded class) of each entry point in ``group``, imported once per process."""
+    return tuple((ep.name, ep.load()) for ep in _cached_entry_points(group))
+ 
+ 
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback apart from the message for the JSONL writer."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        return record
+
+
+class _JSONLinesHandler(logging.Handler):
+    """Appends one JSON object per record to ``path``; runs on the QueueListener thread."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self._stream = open(path, "ab")
+
+    def emit(self, record):
+        try:
+            rec = {
+                "timestamp": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+                .replace(tzinfo=None).isoformat() + "Z",
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.message,
+            }
+            if record.exc_text:
+                rec["exc"] = record.exc_text
+            self._stream.write(_json_dumps_bytes(rec) + b"\n")
+            self._stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            super().close()
+
+
+# _pvalue_stats: below this many p-values the statistics module is cheaper than NumPy
+_PVALUE_STATS_NUMPY_MIN = 32
+# Upper edges of the p-value histogram buckets (a p-value equal to an edge goes up)
+_PVALUE_BUCKET_EDGES = np.array([0.01, 0.05, 0.1])
+
+# Bundled plugins, imported on first lookup: name -> (module, class name)
+_BUILTIN_TRANSFORMS = {'xor_const': ('patternanalyzer.plugins.xor_const', 'XOPlugin')}
+_BUILTIN_TESTS = {'monobit': ('patternanalyzer.plugins.monobit', 'MonobitTest')}
+_BUILTIN_VISUALS = {'fft_placeholder': ('patternanalyzer.plugins.fft_placeholder', 'FFTPlaceholder')}
+
+
+@functools.lru_cache(maxsize=None)
+def _package_version(dist_name: str):
+    """Installed version of ``dist_name`` (None if unknown), read from metadata once per process."""
+    try:
+        return importlib.metadata.version(dist_name)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _plugin_class(module_name: str, class_name: str):
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_plugin(module_name: str, class_name: str):
+    """Plugin instance used by pool tasks, created once per worker process.
+
+    Instances are reused across tasks just as registry entries are reused
+    across tests in the parent.
+    """
+    return _plugin_class(module_name, class_name)()
+
+
+class _PluginRegistry(collections.abc.MutableMapping):
+    """Name -> plugin mapping whose entries can be registered by class loader.
+
+    Lazy entries keep their place in registration order and are imported,
+    instantiated and given their logger on first lookup. An entry whose import
+    or construction fails is logged and dropped, so one broken plugin does not
+    fail every lookup; ``items()`` and ``values()`` skip such entries.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Any] = {}
+        self._specs: Dict[str, Callable[[], type]] = {}
+        # Serializes first-lookup resolution when several threads use the engine
+        self._lock = threading.Lock()
+
+    def register_lazy(self, name: str, load_class: Callable[[], type]) -> None:
+        """Register ``name``; ``load_class()`` returns the plugin class on first lookup."""
+        self._entries[name] = None
+        self._specs[name] = load_class
+
+    def __getitem__(self, name: str):
+        if name in self._specs:
+            with self._lock:
+                # another thread may have resolved (or dropped) it while we waited
+                load_class = self._specs.get(name)
+                if load_class is not None:
+                    try:
+                        plugin = load_class()()
+                    except Exception:
+                        logging.getLogger(__name__).warning("Skipping plugin %r: failed to load", name, exc_info=True)
+                        self._entries.pop(name, None)
+                        self._specs.pop(name, None)
+                        raise KeyError(name) from None
+                    try:
+                        plugin.logger = logging.getLogger(f"patternanalyzer.plugins.{name}")
+                    except Exception:
+                        pass
+                    # publish the plugin before retiring the spec: lock-free readers
+                    # either still see the spec or already see the plugin
+                    self._entries[name] = plugin
+                    self._specs.pop(name, None)
+        return self._entries[name]
+
+    def __setitem__(self, name: str, plugin) -> None:
+        self._specs.pop(name, None)
+        self._entries[name] = plugin
+
+    def __delitem__(self, name: str) -> None:
+        self._specs.pop(name, None)
+        del self._entries[name]
+
+    def __iter__(self):
+        # snapshot: resolving an entry may drop it while callers iterate
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def items(self) -> List[Tuple[str, Any]]:
+        pairs = []
+        for name in self:
+            try:
+                pairs.append((name, self[name]))
+            except KeyError:
+                continue
+        return pairs
+
+    def values(self) -> List[Any]:
+        return [plugin for _, plugin in self.items()]
+
+
 def _run_test_worker(module_name: str, class_name: str, test_name: str, data_bytes: bytes, params: dict):
-    """Worker executed in a subprocess: import the plugin class and run the test.
+    """Worker executed in a subprocess: run the test with the worker's cached plugin instance.
 
     Returns either a TestResult object or a dict with {"test_name", "status":"error", "reason": "..."}.
     This function is module-level so it can be pickled by ProcessPoolExecutor on Windows.
     """
     try:
-        import importlib as _importlib
-        import time as _time
-        # Import plugin API and plugin class inside worker process
-        from patternanalyzer.plugin_api import BytesView, TestResult  # type: ignore
-        mod = _importlib.import_module(module_name)
-        cls = getattr(mod, class_name)
-        inst = cls()
+        inst = _worker_plugin(module_name, class_name)
         bv = BytesView(data_bytes)
-        start = _time.perf_counter()
+        start = time.perf_counter()
         # prefer safe_run when available
         res = inst.safe_run(bv, params) if hasattr(inst, "safe_run") else inst.run(bv, params)
-        end = _time.perf_counter()
+        end = time.perf_counter()
         duration_ms = (end - start) * 1000.0
         if isinstance(res, TestResult):
             try:
@@ -48,77 +242,119 @@ def _run_test_worker(module_name: str, class_name: str, test_name: str, data_byt
                     res.time_ms = duration_ms
             except Exception:
                 pass
-            try:
-                if getattr(res, "bytes_processed", None) is None:
-                    try:
-                        res.bytes_processed = len(bv.to_bytes())
-                    except Exception:
-                        res.bytes_processed = None
-            except Exception:
-                pass
+            if getattr(res, "bytes_processed", None) is None:
+                # data_bytes may be a shared-memory view; its length is the input size
+                res.bytes_processed = len(data_bytes)
         return res
     except Exception as e:
         return {"test_name": test_name, "status": "error", "reason": str(e)}
 
 
-def _run_test_subprocess(self, module_name: str, class_name: str, test_name: str, data_bytes: bytes, params: dict, timeout: float, mem_mb: int = None):
+# Keys identifying a serialized TestResult among runner/worker outputs
+_RUNNER_KEYS = frozenset(("test_name", "passed", "p_value"))
+
+
+def _run_test_worker_shm(shm_name: str, size: int, module_name: str, class_name: str, test_name: str, params: dict):
+    """Pool worker variant of _run_test_worker reading its input from shared memory.
+
+    Only the block's name crosses the process boundary; the plugin's BytesView
+    wraps the shared buffer itself instead of a pickled copy.
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=shm_name)
+    except Exception as e:
+        return {"test_name": test_name, "status": "error", "reason": str(e)}
+    view = shm.buf[:size]
+
+    def _unmap() -> bool:
+        try:
+            view.release()
+            shm.close()
+        except BufferError:
+            return False
+        return True
+
+    try:
+        res = _run_test_worker(module_name, class_name, test_name, view, params)
+        if not _unmap():
+            # The result still references the shared buffer: return a detached copy
+            # so the mapping does not outlive the run in this long-lived worker.
+            try:
+                res = pickle.loads(pickle.dumps(res))
+            except Exception as e:
+                res = {"test_name": test_name, "status": "error", "reason": str(e)}
+            gc.collect()
+            if not _unmap():
+                res = {"test_name": test_name, "status": "error",
+                       "reason": "plugin kept a reference to the shared input buffer"}
+        return res
+    finally:
+        try:
+            view.release()
+        except BufferError:
+            pass
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+def _run_test_subprocess(module_name: str, class_name: str, test_name: str, data_bytes: bytes, params: dict, timeout: float, mem_mb: int = None):
     """Run the plugin in an isolated subprocess by invoking patternanalyzer.sandbox_runner.
 
-    Communicates via stdin/stdout JSON. Enforces a per-test timeout by using subprocess.run(..., timeout=...).
+    Sends a one-line JSON header followed by the raw input bytes on stdin and reads a JSON
+    result from stdout. Enforces a per-test timeout by killing the runner when it expires.
     Returns either a TestResult object (reconstructed) or an error dict similar to _run_test_worker.
     """
     try:
-        # Prepare payload for the runner
-        payload = {
+        # Header for the runner; the input follows it verbatim (no base64 inflation)
+        header = {
             "module": module_name,
             "class": class_name,
             "test_name": test_name,
-            "data_b64": base64.b64encode(data_bytes).decode("ascii") if data_bytes is not None else None,
+            "data_len": len(data_bytes) if data_bytes is not None else None,
             "params": params or {},
             "mem_mb": mem_mb,
         }
         cmd = [sys.executable, "-m", "patternanalyzer.sandbox_runner"]
-        # Run runner, send payload on stdin and capture stdout
-        proc = subprocess.run(cmd, input=json.dumps(payload), text=True, capture_output=True, timeout=timeout)
-        out = proc.stdout.strip()
-        if not out:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            proc.stdin.write(json.dumps(header).encode("utf-8") + b"\n")
+            stdout, stderr = proc.communicate(input=data_bytes or b"", timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+        # JSON parsers skip surrounding whitespace: no need to copy the output to strip it
+        out = stdout
+        if not out or out.isspace():
             # no output -> treat as error
-            stderr = proc.stderr.strip() if proc.stderr else ""
-            return {"test_name": test_name, "status": "error", "reason": f"no_output {stderr}"}
+            err = stderr.decode("utf-8", errors="replace").strip() if stderr else ""
+            return {"test_name": test_name, "status": "error", "reason": f"no_output {err}"}
         try:
-            res = json.loads(out)
+            try:
+                res = _json_loads(out)
+            except ValueError:
+                # orjson is strict JSON; json.dumps in the runner may emit NaN/Infinity
+                if _json_loads is json.loads:
+                    raise
+                res = json.loads(out)
         except Exception as e:
-            return {"test_name": test_name, "status": "error", "reason": f"invalid_runner_output: {e}; raw={out}"}
+            return {"test_name": test_name, "status": "error", "reason": f"invalid_runner_output: {e}; raw={out.decode('utf-8', errors='replace').strip()}"}
         # Runner returns either a serialized TestResult dict (with 'test_name' and 'p_value' etc) or an error dict
         if isinstance(res, dict) and res.get("status") == "error":
             return {"test_name": test_name, "status": "error", "reason": res.get("reason")}
         # If runner returned a serialized TestResult-like dict, reconstruct TestResult
         try:
-            if isinstance(res, dict) and "test_name" in res and "passed" in res and "p_value" in res:
-                # Map fields back to TestResult constructor
-                tr_kwargs = {
-                    "test_name": res.get("test_name"),
-                    "passed": res.get("passed"),
-                    "p_value": res.get("p_value"),
-                    "category": res.get("category", "statistical"),
-                    "p_values": res.get("p_values", {}) or {},
-                    "effect_sizes": res.get("effect_sizes", {}) or {},
-                    "flags": res.get("flags", []) or [],
-                    "metrics": res.get("metrics", {}) or {},
-                    "z_score": res.get("z_score"),
-                    "evidence": res.get("evidence"),
-                    "time_ms": res.get("time_ms"),
-                    "bytes_processed": res.get("bytes_processed"),
-                }
-                tr = TestResult(**tr_kwargs)
-                return tr
+            if isinstance(res, dict) and _RUNNER_KEYS <= res.keys():
+                return TestResult.from_runner_dict(res)
         except Exception:
             # Fall back to returning raw dict if reconstruction fails
             return res
         return res
     except subprocess.TimeoutExpired:
         try:
-            # subprocess.run should have killed the process on timeout; return normalized timeout error
+            # the runner has been killed above; return normalized timeout error
             return {"test_name": test_name, "status": "error", "reason": "timeout"}
         except Exception:
             return {"test_name": test_name, "status": "error", "reason": "timeout"}
@@ -130,41 +366,48 @@ class Engine:
     """Main analysis engine for Pattern Analyzer."""
  
     def __init__(self):
-        self._transforms: Dict[str, TransformPlugin] = {}
-        self._tests: Dict[str, TestPlugin] = {}
-        self._visuals: Dict[str, VisualPlugin] = {}
+        self._transforms: Dict[str, TransformPlugin] = _PluginRegistry()
+        self._tests: Dict[str, TestPlugin] = _PluginRegistry()
+        self._visuals: Dict[str, VisualPlugin] = _PluginRegistry()
         # Map of configured log_path -> handler to avoid duplicate handlers across analyze calls
         self._log_handlers: Dict[str, logging.Handler] = {}
+        # log_path -> listener thread writing that path's records
+        self._log_listeners: Dict[str, logging.handlers.QueueListener] = {}
+        # Resolved once: the per-test loops log through it
+        self._engine_logger = logging.getLogger(__name__)
+        # Worker processes for parallel runs, started on first use and kept across analyze calls
+        self._process_pool = None
+        self._process_pool_workers = 0
+        self._process_pool_start_method = None
         self._discover_plugins()
  
     def _discover_plugins(self):
         """Discover plugins via entry points."""
-        # Register built-in plugins
-        from .plugins.xor_const import XOPlugin
-        from .plugins.monobit import MonobitTest
+        # Register built-in plugins (imported when first looked up)
+        for registry, builtins in ((self._transforms, _BUILTIN_TRANSFORMS),
+                                   (self._tests, _BUILTIN_TESTS),
+                                   (self._visuals, _BUILTIN_VISUALS)):
+            for name, (module_name, class_name) in builtins.items():
+                registry.register_lazy(name, functools.partial(_plugin_class, module_name, class_name))
 
-        self.register_transform('xor_const', XOPlugin())
-        self.register_test('monobit', MonobitTest())
-
-        # Register known bundled Visual plugins (optional)
-        try:
-            from .plugins.fft_placeholder import FFTPlaceholder
-            self.register_visual('fft_placeholder', FFTPlaceholder())
-        except Exception:
-            # ignore if bundled visual plugin cannot be imported for any reason
-            pass
-
-        # Load plugins published via entry points (group: 'patternanalyzer.plugins')
-        import importlib.metadata as im
-        for ep in im.entry_points(group='patternanalyzer.plugins'):
-            cls = ep.load()
+        # Legacy single group ('patternanalyzer.plugins'): the kind is only known
+        # from the class, so these are imported up front and triaged here
+        for name, cls in _entry_point_classes('patternanalyzer.plugins'):
             if issubclass(cls, TransformPlugin):
-                self.register_transform(ep.name, cls())
+                self.register_transform(name, cls())
             elif issubclass(cls, TestPlugin):
-                self.register_test(ep.name, cls())
+                self.register_test(name, cls())
             elif issubclass(cls, VisualPlugin):
                 # Entry point class implements VisualPlugin
-                self.register_visual(ep.name, cls())
+                self.register_visual(name, cls())
+
+        # Per-kind groups name the plugin kind in metadata, so nothing is
+        # imported until the plugin is first looked up
+        for registry, group in ((self._transforms, 'patternanalyzer.transforms'),
+                                (self._tests, 'patternanalyzer.tests'),
+                                (self._visuals, 'patternanalyzer.visuals')):
+            for ep in _cached_entry_points(group):
+                registry.register_lazy(ep.name, ep.load)
 
     def get_profile(self, name: str) -> dict:
         """Return a preset profile mapping for tests/transforms.
@@ -204,7 +447,8 @@ class Engine:
     def _configure_logging(self, config: Dict[str, Any]) -> None:
         """Configure logging based on config options.
  
-        - If config contains 'log_path', attach a FileHandler that writes JSONL log records.
+        - If config contains 'log_path', attach a queue handler whose background listener
+          writes JSONL log records to that file (flushed and detached by ``close()``).
         - Respect 'log_level' in config (default INFO). Avoid adding duplicate handlers.
         """
         try:
@@ -235,34 +479,23 @@ class Engine:
                 existing.setLevel(level_no)
                 return
  
-            # Create a JSONL file handler
-            fh = logging.FileHandler(log_path, encoding="utf-8")
-            fh.setLevel(level_no)
- 
-            class _JSONFormatter(logging.Formatter):
-                def format(self, record):
-                    try:
-                        rec = {
-                            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-                            "level": record.levelname,
-                            "logger": record.name,
-                            "message": record.getMessage(),
-                        }
-                        if record.exc_info:
-                            import traceback
-                            rec["exc"] = "".join(traceback.format_exception(*record.exc_info))
-                        return json.dumps(rec, ensure_ascii=False)
-                    except Exception:
-                        return super().format(record)
- 
-            fh.setFormatter(_JSONFormatter())
-            root_logger.addHandler(fh)
+            # Records are queued by the logging thread and serialized/written
+            # as JSONL by a background listener
+            log_queue = queue.SimpleQueue()
+            qh = _RecordQueueHandler(log_queue)
+            qh.setLevel(level_no)
+            listener = logging.handlers.QueueListener(log_queue, _JSONLinesHandler(log_path))
+            listener.start()
+            # Drain the queue at exit if close() is never called
+            atexit.register(listener.stop)
+            root_logger.addHandler(qh)
             # Track handler so repeated analyze() calls don't add duplicates
-            self._log_handlers[log_path] = fh
+            self._log_handlers[log_path] = qh
+            self._log_listeners[log_path] = listener
         except Exception:
             # Logging must never break the engine
             try:
-                logging.getLogger(__name__).exception("Failed to configure logging")
+                self._engine_logger.exception("Failed to configure logging")
             except Exception:
                 pass
  
@@ -289,10 +522,102 @@ class Engine:
         except Exception:
             pass
         self._visuals[name] = plugin
+    def _get_process_pool(self, max_workers: int, start_method: str = None, preload=()) -> concurrent.futures.ProcessPoolExecutor:
+        """Return the long-lived worker pool, (re)starting it if needed.
+
+        Interpreter start-up is paid once per pool rather than once per analyze call.
+        ``start_method`` picks the multiprocessing context (platform default when
+        None). With 'forkserver', workers fork from a small server that has imported
+        NumPy, the engine and the ``preload`` modules, instead of from this process;
+        the preload list only takes effect when the server is first started.
+        """
+        pool = self._process_pool
+        if (pool is None or self._process_pool_workers != max_workers
+                or self._process_pool_start_method != start_method or getattr(pool, "_broken", False)):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            mp_context = None
+            if start_method:
+                try:
+                    mp_context = multiprocessing.get_context(start_method)
+                except ValueError:
+                    # unsupported on this platform: keep the default
+                    mp_context = None
+                if start_method == "forkserver" and mp_context is not None:
+                    mp_context.set_forkserver_preload(["numpy", __name__, *preload])
+            pool = self._process_pool = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context)
+            self._process_pool_workers = max_workers
+            self._process_pool_start_method = start_method
+        return pool
+
+    def _discard_process_pool(self) -> None:
+        """Terminate the worker pool so the next parallel run starts a fresh one.
+
+        Used when a test overran its timeout: cancelling its future cannot stop a
+        task that is already running, and the wedged worker would otherwise stay
+        busy for later runs on this Engine.
+        """
+        pool = self._process_pool
+        if pool is None:
+            return
+        self._process_pool = None
+        self._process_pool_workers = 0
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        for proc in processes:
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+        pool.shutdown(wait=False, cancel_futures=True)
+        for proc in processes:
+            try:
+                proc.join(timeout=5.0)
+            except Exception:
+                pass
+
+    @contextlib.contextmanager
+    def _shared_input(self, data_bytes):
+        """Publish the input bytes in a SharedMemory block for the pool workers.
+
+        Yields None when there is nothing to share or shared memory is unavailable;
+        callers then pass the bytes to the workers directly.
+        """
+        shm = None
+        if data_bytes:
+            try:
+                shm = shared_memory.SharedMemory(create=True, size=len(data_bytes))
+                shm.buf[:len(data_bytes)] = data_bytes
+            except Exception:
+                shm = None
+        try:
+            yield shm
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    def close(self) -> None:
+        """Shut down the worker pool used for parallel runs (restarted on demand) and
+        flush and detach the JSONL log handlers."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
+            self._process_pool_workers = 0
+        root_logger = logging.getLogger()
+        for log_path, listener in self._log_listeners.items():
+            root_logger.removeHandler(self._log_handlers.pop(log_path))
+            atexit.unregister(listener.stop)
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        self._log_listeners.clear()
+
     def analyze(self, input_bytes: bytes, config: Dict[str, Any]) -> Dict[str, Any]:
         """Backwards-compatible wrapper that dispatches to the concrete implementation.
 
         The real implementation was renamed to `_analyze_impl` to avoid ambiguity.
+        ``input_bytes`` may also be a BytesView; reusing one view across calls
+        hashes the input only once.
         """
         impl = getattr(self, "_analyze_impl", None)
         if callable(impl):
@@ -308,27 +633,32 @@ class Engine:
         m = len(p_values)
         if m == 0:
             return []
-        # Pair p-values with original indices
-        indexed = sorted(enumerate(p_values), key=lambda x: x[1])
-        rejected = [False] * m
+        p = np.asarray(p_values, dtype=np.float64)
+        order = np.argsort(p, kind='stable')
         # Find the largest k such that p_(k) <= (k/m) * q (1-based k)
-        max_k = 0
-        for rank, (idx, p) in enumerate(indexed, start=1):
-            if p <= (rank / m) * q:
-                max_k = rank
-        if max_k == 0:
-            return rejected
-        # Mark all with rank <= max_k as rejected
-        for rank, (idx, p) in enumerate(indexed, start=1):
-            if rank <= max_k:
-                rejected[idx] = True
-        return rejected
+        ok = np.flatnonzero(p[order] <= (np.arange(1, m + 1) / m) * q)
+        rejected = np.zeros(m, dtype=bool)
+        if ok.size:
+            # Mark all with rank <= max_k as rejected
+            rejected[order[:ok[-1] + 1]] = True
+        return rejected.tolist()
  
     def _pvalue_stats(self, p_values: List[float]) -> Dict[str, Any]:
         """Return simple statistics and a small histogram for p-values distribution."""
         if not p_values:
             return {"count": 0, "mean": None, "median": None, "stdev": None, "histogram": {}}
         cnt = len(p_values)
+        if cnt >= _PVALUE_STATS_NUMPY_MIN:
+            # Large suites: NumPy reductions (equal to the statistics module up to rounding)
+            arr = np.asarray(p_values, dtype=np.float64)
+            counts = np.bincount(np.searchsorted(_PVALUE_BUCKET_EDGES, arr, side='right'), minlength=4)
+            return {
+                "count": cnt,
+                "mean": float(arr.mean()),
+                "median": float(np.median(arr)),
+                "stdev": float(arr.std()),
+                "histogram": dict(zip(("0-0.01", "0.01-0.05", "0.05-0.1", "0.1-1.0"), counts.tolist())),
+            }
         mean = statistics.mean(p_values)
         median = statistics.median(p_values)
         stdev = statistics.pstdev(p_values) if cnt > 1 else 0.0
@@ -358,6 +688,15 @@ class Engine:
         except Exception:
             return ""
     
+    @staticmethod
+    def _input_view(input_bytes) -> BytesView:
+        """Wrap ``input_bytes`` for one analyze/discover call.
+
+        A BytesView is used as-is, so a caller analyzing the same data several
+        times can pass one view and its cached SHA-256 is computed only once.
+        """
+        return input_bytes if isinstance(input_bytes, BytesView) else BytesView(input_bytes)
+
     def _beam_discover(self, data: BytesView, config: Dict[str, Any]) -> Dict[str, Any]:
         """Simple beam-like discovery that tries single-byte XOR and ROT (add) transforms.
 
@@ -371,81 +710,51 @@ class Engine:
 
         raw = data.to_bytes()
         length = len(raw) or 1
+        arr = np.frombuffer(raw, dtype=np.uint8)
 
-        def ascii_print_ratio(bts: bytes) -> float:
-            cnt = 0
-            for c in bts:
-                # consider typical printable ASCII plus common whitespace
-                if 32 <= c <= 126 or c in (9, 10, 13):
-                    cnt += 1
-            return cnt / length
-
-        def shannon_entropy(bts: bytes) -> float:
-            if not bts:
-                return 0.0
-            freqs = {}
-            for c in bts:
-                freqs[c] = freqs.get(c, 0) + 1
-            ent = 0.0
-            for v in freqs.values():
-                p = v / len(bts)
-                ent -= p * math.log2(p)
-            return ent  # bits per symbol (0..8 for bytes)
+        # Every candidate is a byte bijection of raw, so its histogram is a
+        # permutation of raw's: score all 768 candidates from one bincount.
+        base_hist = np.bincount(arr, minlength=256)
+        rot = np.stack([_BEAM_SUB_PRINTABLE @ base_hist, _BEAM_ADD_PRINTABLE @ base_hist], axis=1)
+        printable = np.concatenate([_BEAM_XOR_PRINTABLE @ base_hist, rot.ravel()]) / length
+        # Entropy is permutation invariant, hence the same for every candidate:
+        # H = log2(n) - sum(c * log2(c)) / n over the nonzero counts.
+        ent = 0.0
+        if raw:
+            counts = base_hist[base_hist > 0]
+            ent = max(0.0, math.log2(len(raw)) - float(counts @ np.log2(counts)) / len(raw))
+        scores = (printable * 2.0) - (ent / 8.0)
 
-        candidates = []
-        # Try single-byte XOR keys
-        for k in range(256):
-            out = bytes((b ^ k) & 0xFF for b in raw)
-            apr = ascii_print_ratio(out)
-            ent = shannon_entropy(out)
-            # Heuristic score: favor printable ratio, penalize entropy
-            score = (apr * 2.0) - (ent / 8.0)
-            candidates.append({
-                "chain": [{"name": "xor_const", "params": {"xor_value": k}}],
-                "method": "single-byte-xor",
-                "key": k,
-                "plaintext_bytes": out,
-                "printable_ratio": apr,
-                "entropy": ent,
-                "score": score,
-            })
+        # Candidate order: XOR keys 0..255, then (rot dec k, rot enc k) pairs.
+        # A stable sort on -score keeps list.sort(reverse=True)'s tie order.
+        order = np.argsort(-scores, kind='stable')[:top_n]
 
-        # Try single-byte ROT (add/subtract)
-        for k in range(256):
-            out = bytes((b - k) & 0xFF for b in raw)
-            apr = ascii_print_ratio(out)
-            ent = shannon_entropy(out)
-            score = (apr * 2.0) - (ent / 8.0)
+        candidates = []
+        for idx in order.tolist():
+            if idx < 256:
+                k = idx
+                chain = [{"name": "xor_const", "params": {"xor_value": k}}]
+                method = "single-byte-xor"
+                out = np.bitwise_xor(arr, np.uint8(k)).tobytes()
+            else:
+                k, enc = divmod(idx - 256, 2)
+                mode = "enc" if enc else "dec"
+                chain = [{"name": "rot_n", "params": {"rot": k, "mode": mode}}]
+                method = "rot_" + mode
+                out = (np.add if enc else np.subtract)(arr, np.uint8(k)).tobytes()
             candidates.append({
-                "chain": [{"name": "rot_n", "params": {"rot": k, "mode": "dec"}}],
-                "method": "rot_dec",
+                "chain": chain,
+                "method": method,
                 "key": k,
                 "plaintext_bytes": out,
-                "printable_ratio": apr,
+                "printable_ratio": float(printable[idx]),
                 "entropy": ent,
-                "score": score,
+                "score": float(scores[idx]),
             })
 
-            out2 = bytes((b + k) & 0xFF for b in raw)
-            apr2 = ascii_print_ratio(out2)
-            ent2 = shannon_entropy(out2)
-            score2 = (apr2 * 2.0) - (ent2 / 8.0)
-            candidates.append({
-                "chain": [{"name": "rot_n", "params": {"rot": k, "mode": "enc"}}],
-                "method": "rot_enc",
-                "key": k,
-                "plaintext_bytes": out2,
-                "printable_ratio": apr2,
-                "entropy": ent2,
-                "score": score2,
-            })
-
-        # Sort candidates by score descending
-        candidates.sort(key=lambda x: x["score"], reverse=True)
-
         # Prepare top results with safe previews (try to decode text if mostly printable)
         results = []
-        for c in candidates[:top_n]:
+        for c in candidates:
             out = c["plaintext_bytes"]
             preview = ""
             try:
@@ -469,7 +778,7 @@ class Engine:
         # Minimal meta for reproducibility
         meta: Dict[str, Any] = {}
         try:
-            meta["input_hash"] = hashlib.sha256(raw).hexdigest()
+            meta["input_hash"] = data.sha256_hex()
         except Exception:
             meta["input_hash"] = None
 
@@ -479,6 +788,80 @@ class Engine:
         }
         return output
 
+    def _attach_visuals(self, jobs, visuals_conf: Dict[str, Any], artefact_dir, workers: int = 1) -> None:
+        """Render every visual plugin for each (serialized entry, TestResult) in ``jobs``.
+
+        Each plugin renders its results in order. With ``workers`` > 1 (config
+        ``visual_workers``), up to that many plugins render concurrently on their own
+        threads, which requires every registered ``render`` to be thread-safe (no
+        shared global state such as ``matplotlib.pyplot``'s current figure); a
+        plugin's ``render`` is never re-entered either way.
+        Artifacts go to ``entry['visuals']`` and failures to ``entry['visual_errors']``.
+        """
+        visuals = self._visuals.items()
+        if not visuals:
+            return
+
+        def render_all(vname, vplugin):
+            vparams = visuals_conf.get(vname, {})
+            return [self._render_visual(vname, vplugin, r, vparams, s.get('test_name'), artefact_dir)
+                    for s, r in jobs]
+
+        workers = min(workers, len(visuals))
+        if workers > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pa-visual') as vpool:
+                rendered = list(vpool.map(render_all, *zip(*visuals)))
+        else:
+            rendered = [render_all(vname, vplugin) for vname, vplugin in visuals]
+
+        for j, (s, _) in enumerate(jobs):
+            visuals_artifacts: Dict[str, Dict[str, str]] = {}
+            for (vname, _), outcomes in zip(visuals, rendered):
+                artifact, error = outcomes[j]
+                if error is not None:
+                    # Visual plugin failed for this result: keep test status completed.
+                    s.setdefault('visual_errors', []).append({'visual_name': vname, 'details': error})
+                elif artifact is not None:
+                    visuals_artifacts[vname] = artifact
+            if visuals_artifacts:
+                s['visuals'] = visuals_artifacts
+
+    @staticmethod
+    def _render_visual(vname: str, vplugin, r: TestResult, vparams: Dict[str, Any], test_name, artefact_dir):
+        """Render one visual for one result. Returns (artifact or None, error details or None)."""
+        try:
+            out_bytes = vplugin.render(r, vparams)
+            if not isinstance(out_bytes, (bytes, bytearray)):
+                return None, None
+            mime = vparams.get('mime', 'image/svg+xml')
+            if artefact_dir:
+                # write bytes to file under artefact_dir and return path in JSON
+                try:
+                    os.makedirs(artefact_dir, exist_ok=True)
+                    # choose extension based on mime
+                    if mime == 'image/svg+xml':
+                        ext = 'svg'
+                    elif 'png' in mime:
+                        ext = 'png'
+                    elif 'jpeg' in mime or 'jpg' in mime:
+                        ext = 'jpg'
+                    else:
+                        ext = 'bin'
+                    safe_name = str(test_name or 'visual').replace(" ", "_")
+                    fname = f"{safe_name}_{vname}_{uuid.uuid4().hex}.{ext}"
+                    path = os.path.join(artefact_dir, fname)
+                    with open(path, "wb") as wf:
+                        wf.write(bytes(out_bytes))
+                    return {'mime': mime, 'path': path}, None
+                except Exception as e:
+                    # If writing the artifact fails, record a visual error but do not fail the test.
+                    return None, str(e)
+            # fallback: embed as base64 data URI (existing behaviour)
+            data_b64 = base64.b64encode(bytes(out_bytes)).decode('ascii')
+            return {'mime': mime, 'data_base64': data_b64}, None
+        except Exception as e:
+            return None, str(e)
+
     def _analyze_impl(self, input_bytes: bytes, config: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze input bytes using registered plugins and perform FDR + scorecard.
 
@@ -491,9 +874,10 @@ class Engine:
 
         Returns a dict with 'results' (serialized) and 'scorecard'.
         """
-        # Normalize input
-        data = BytesView(input_bytes)
-        logging.getLogger(__name__).debug("Engine.analyze start - registered tests: %s", list(self._tests.keys()))
+        # Normalize input (kept as source: transforms rebind data)
+        data = source = self._input_view(input_bytes)
+        if self._engine_logger.isEnabledFor(logging.DEBUG):
+            self._engine_logger.debug("Engine.analyze start - registered tests: %s", list(self._tests.keys()))
         # Configure logging (attach JSONL file handler when requested)
         try:
             self._configure_logging(config)
@@ -556,7 +940,7 @@ class Engine:
                     }
 
         # Determine tests to run: use provided list or all registered tests
-        tests_conf = config.get('tests') or [{'name': n, 'params': {}} for n in self._tests]
+        tests_conf = list(config.get('tests') or [{'name': n, 'params': {}} for n in self._tests])
 
         # Run tests but honor TestPlugin.requires: if required input not available, skip the test
         raw_results: List[object] = []  # elements are either TestResult or dict indicating skipped
@@ -569,24 +953,49 @@ class Engine:
         sandbox_mode = bool(config.get('sandbox_mode', False))
         sandbox_mem_mb = int(config.get('sandbox_mem_mb', 0)) if config.get('sandbox_mem_mb') is not None else None
 
+        # Transforms are done, so the data is fixed: size it once and check each
+        # input requirement at most once per analysis instead of once per test.
+        try:
+            data_len = len(data)
+        except Exception:
+            data_len = None
+        _reqs_ok: Dict[str, bool] = {}
+
+        def _missing_requirements(reqs) -> List[str]:
+            missing: List[str] = []
+            for req in reqs:
+                ok = _reqs_ok.get(req)
+                if ok is None:
+                    if req in ('bits', 'bytes'):
+                        try:
+                            data.bit_view() if req == 'bits' else data.to_bytes()
+                            ok = True
+                        except Exception:
+                            ok = False
+                    elif req == 'text':
+                        ok = data.text_view() is not None
+                    else:
+                        # Unknown requirement: check attribute presence on BytesView
+                        ok = hasattr(data, req)
+                    _reqs_ok[req] = ok
+                if not ok:
+                    missing.append(req)
+            return missing
+
         if not parallel:
             # Sequential execution (original behaviour)
-            for c in tests_conf:
+            # One warm worker thread runs every test so each can be given a timeout;
+            # it is only replaced when a timed-out test leaves it wedged.
+            tpool = None
+            for i, c in enumerate(tests_conf):
                 # Budget check: skip remaining if overall budget exceeded
                 if budget_ms is not None:
                     elapsed_ms = (time.perf_counter() - overall_start) * 1000.0
                     if elapsed_ms >= budget_ms:
-                        # mark remaining tests as skipped due to budget exhaustion
+                        # mark this and the rest of tests_conf as skipped due to budget exhaustion
                         raw_results.append({"test_name": c['name'], "status": "skipped", "reason": "budget_exhausted"})
-                        # append skips for the rest of tests_conf and break out
-                        # determine index of current test and skip subsequent ones
-                        try:
-                            idx = tests_conf.index(c)
-                        except Exception:
-                            idx = None
-                        if idx is not None:
-                            for rem in tests_conf[idx+1:]:
-                                raw_results.append({"test_name": rem.get('name'), "status": "skipped", "reason": "budget_exhausted"})
+                        for rem in tests_conf[i+1:]:
+                            raw_results.append({"test_name": rem.get('name'), "status": "skipped", "reason": "budget_exhausted"})
                         break
 
                 # Allow missing/unregistered tests to be gracefully skipped instead of raising KeyError.
@@ -594,29 +1003,7 @@ class Engine:
                 if tp is None:
                     raw_results.append({"test_name": c.get('name'), "status": "skipped", "reason": "test_not_registered"})
                     continue
-                reqs = getattr(tp, 'requires', []) or []
-                missing_reqs: List[str] = []
-                # Lazy caches for data views that may be expensive
-                _bits_cached = None
-                for req in reqs:
-                    if req == 'bits':
-                        try:
-                            if _bits_cached is None:
-                                _bits_cached = data.bit_view()
-                        except Exception:
-                            missing_reqs.append('bits')
-                    elif req == 'bytes':
-                        try:
-                            _ = data.to_bytes()
-                        except Exception:
-                            missing_reqs.append('bytes')
-                    elif req == 'text':
-                        if data.text_view() is None:
-                            missing_reqs.append('text')
-                    else:
-                        # Unknown requirement: check attribute presence on BytesView
-                        if not hasattr(data, req):
-                            missing_reqs.append(req)
+                missing_reqs = _missing_requirements(getattr(tp, 'requires', []) or [])
                 if missing_reqs:
                     reason = (
                         f"Required input '{missing_reqs[0]}' not available"
@@ -626,10 +1013,7 @@ class Engine:
                     raw_results.append({"test_name": c['name'], "status": "skipped", "reason": reason})
                 else:
                     # Prepare lightweight observability measurements for this test invocation.
-                    try:
-                        bytes_processed = len(data.to_bytes())
-                    except Exception:
-                        bytes_processed = None
+                    bytes_processed = data_len
 
                     # run the test using the plugin's safe_run wrapper (if available)
                     # while measuring execution time (ms).
@@ -649,21 +1033,25 @@ class Engine:
                         timeout_sec = min(timeout_sec, max(0.001, remaining_ms / 1000.0))
                     # Engine-level debug logging for observability
                     try:
-                        logging.getLogger("patternanalyzer.engine").debug("starting_test", extra={"test_name": c.get("name"), "params": params, "timeout_sec": timeout_sec, "bytes_processed": bytes_processed})
+                        if self._engine_logger.isEnabledFor(logging.DEBUG):
+                            self._engine_logger.debug("starting_test", extra={"test_name": c.get("name"), "params": params, "timeout_sec": timeout_sec, "bytes_processed": bytes_processed})
                     except Exception:
                         pass
                     try:
-                        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as tpool:
-                            fut = tpool.submit(tp.safe_run if hasattr(tp, "safe_run") else tp.run, data, params)
-                            res = fut.result(timeout=timeout_sec)
+                        if tpool is None:
+                            tpool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='pa-test')
+                        fut = tpool.submit(tp.safe_run if hasattr(tp, "safe_run") else tp.run, data, params)
+                        res = fut.result(timeout=timeout_sec)
                         end = time.perf_counter()
                         duration_ms = (end - start) * 1000.0
                     except concurrent.futures.TimeoutError:
                         # Mark as timeout error and continue; do not let a hung plugin block the engine.
+                        tpool.shutdown(wait=False)
+                        tpool = None
                         res = {"test_name": c['name'], "status": "error", "reason": "timeout"}
                         duration_ms = timeout_sec * 1000.0
                         try:
-                            logging.getLogger("patternanalyzer.engine").warning("test_timeout", extra={"test_name": c.get("name"), "timeout_sec": timeout_sec})
+                            self._engine_logger.warning("test_timeout", extra={"test_name": c.get("name"), "timeout_sec": timeout_sec})
                         except Exception:
                             pass
                     except Exception as e:
@@ -672,12 +1060,13 @@ class Engine:
                         end = time.perf_counter()
                         duration_ms = (end - start) * 1000.0
                         try:
-                            logging.getLogger("patternanalyzer.engine").exception("test_exception", extra={"test_name": c.get("name"), "err": str(e)})
+                            self._engine_logger.exception("test_exception", extra={"test_name": c.get("name"), "err": str(e)})
                         except Exception:
                             pass
                     # Completed run: rich debug
                     try:
-                        logging.getLogger("patternanalyzer.engine").debug("finished_test", extra={"test_name": c.get("name"), "status": res.get("status") if isinstance(res, dict) else getattr(res, "passed", None), "time_ms": duration_ms})
+                        if self._engine_logger.isEnabledFor(logging.DEBUG):
+                            self._engine_logger.debug("finished_test", extra={"test_name": c.get("name"), "status": res.get("status") if isinstance(res, dict) else getattr(res, "passed", None), "time_ms": duration_ms})
                     except Exception:
                         pass
 
@@ -703,6 +1092,8 @@ class Engine:
                     else:
                         # fallback: append whatever the plugin returned
                         raw_results.append(res)
+            if tpool is not None:
+                tpool.shutdown(wait=True)
         else:
             # Parallel execution using ProcessPoolExecutor
             # Prepare submission list preserving order
@@ -713,31 +1104,21 @@ class Engine:
                 data_bytes = data.to_bytes()
             except Exception:
                 data_bytes = None
+            # the snapshot doubles as the 'bytes' requirement probe
+            _reqs_ok['bytes'] = data_bytes is not None
 
-            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # Optional multiprocessing start method for the pool, e.g. 'forkserver'
+            # so workers do not fork this (possibly large) process
+            start_method = config.get('pool_start_method')
+            preload = ()
+            if start_method == 'forkserver':
+                preload = sorted({tp.__class__.__module__ for tp in (self._tests.get(c['name']) for c in tests_conf)
+                                  if tp is not None} - {'__main__'})
+            executor = self._get_process_pool(max_workers, start_method, preload)
+            with self._shared_input(data_bytes) as shm:
                 for c in tests_conf:
                     tp = self._tests[c['name']]
-                    reqs = getattr(tp, 'requires', []) or []
-                    missing_reqs: List[str] = []
-                    _bits_cached = None
-                    for req in reqs:
-                        if req == 'bits':
-                            try:
-                                if _bits_cached is None:
-                                    _bits_cached = data.bit_view()
-                            except Exception:
-                                missing_reqs.append('bits')
-                        elif req == 'bytes':
-                            try:
-                                _ = data.to_bytes()
-                            except Exception:
-                                missing_reqs.append('bytes')
-                        elif req == 'text':
-                            if data.text_view() is None:
-                                missing_reqs.append('text')
-                        else:
-                            if not hasattr(data, req):
-                                missing_reqs.append(req)
+                    missing_reqs = _missing_requirements(getattr(tp, 'requires', []) or [])
                     if missing_reqs:
                         reason = (
                             f"Required input '{missing_reqs[0]}' not available"
@@ -755,17 +1136,22 @@ class Engine:
                             # fallback to sequential local run
                             submissions.append((c, None))
                             continue
-                        # When sandbox_mode is requested, run each plugin invocation in a dedicated subprocess
+                        # Pool workers are shared by every test in the run, so a plugin that
+                        # kills its process would break the pool for all of them: sandboxed
+                        # tests get a dedicated sandbox_runner interpreter each.
                         if sandbox_mode:
-                            # Submit a thread-wrapped subprocess runner so the ProcessPoolExecutor isn't required to
-                            # spawn additional worker processes; keep using the existing 'executor' for ordering.
-                            future = executor.submit(self._run_test_subprocess, mod_name, cls_name, c['name'], data_bytes, params, per_test_timeout, sandbox_mem_mb)
+                            future = executor.submit(_run_test_subprocess, mod_name, cls_name, c['name'], data_bytes, params, per_test_timeout, sandbox_mem_mb)
+                        elif shm is not None:
+                            future = executor.submit(_run_test_worker_shm, shm.name, len(data_bytes), mod_name, cls_name, c['name'], params)
                         else:
                             future = executor.submit(_run_test_worker, mod_name, cls_name, c['name'], data_bytes, params)
                         submissions.append((c, future))
 
-                # Collect results in the original order
-                for c, future in submissions:
+                # Collect results in the original order; local fallbacks share one
+                # worker thread, replaced only when a timed-out test leaves it wedged.
+                tpool = None
+                pool_wedged = False
+                for i, (c, future) in enumerate(submissions):
                     # Budget check before awaiting this test's result
                     if budget_ms is not None:
                         elapsed_ms = (time.perf_counter() - overall_start) * 1000.0
@@ -773,7 +1159,7 @@ class Engine:
                             # Skip this and any remaining tests
                             raw_results.append({"test_name": c['name'], "status": "skipped", "reason": "budget_exhausted"})
                             # cancel and mark remaining submissions as skipped
-                            for rc, rf in submissions[submissions.index((c, future))+1:]:
+                            for rc, rf in submissions[i+1:]:
                                 try:
                                     if rf is not None:
                                         rf.cancel()
@@ -785,10 +1171,7 @@ class Engine:
                     if future is None:
                         # execute locally (fallback)
                         tp = self._tests[c['name']]
-                        try:
-                            bytes_processed = len(data.to_bytes())
-                        except Exception:
-                            bytes_processed = None
+                        bytes_processed = data_len
                         # Run local fallback with a bounded timeout similar to sequential path
                         params = c.get('params', {}) or {}
                         start = time.perf_counter()
@@ -803,19 +1186,23 @@ class Engine:
                         try:
                             # local fallback execution with logging similar to sequential path
                             try:
-                                logging.getLogger("patternanalyzer.engine").debug("starting_local_fallback", extra={"test_name": c.get("name"), "params": params, "timeout_sec": timeout_sec})
+                                if self._engine_logger.isEnabledFor(logging.DEBUG):
+                                    self._engine_logger.debug("starting_local_fallback", extra={"test_name": c.get("name"), "params": params, "timeout_sec": timeout_sec})
                             except Exception:
                                 pass
-                            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as tpool:
-                                fut = tpool.submit(tp.safe_run if hasattr(tp, "safe_run") else tp.run, data, params)
-                                res = fut.result(timeout=timeout_sec)
+                            if tpool is None:
+                                tpool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='pa-fallback')
+                            fut = tpool.submit(tp.safe_run if hasattr(tp, "safe_run") else tp.run, data, params)
+                            res = fut.result(timeout=timeout_sec)
                             end = time.perf_counter()
                             duration_ms = (end - start) * 1000.0
                         except concurrent.futures.TimeoutError:
+                            tpool.shutdown(wait=False)
+                            tpool = None
                             res = {"test_name": c['name'], "status": "error", "reason": "timeout"}
                             duration_ms = timeout_sec * 1000.0
                             try:
-                                logging.getLogger("patternanalyzer.engine").warning("local_fallback_timeout", extra={"test_name": c.get("name"), "timeout_sec": timeout_sec})
+                                self._engine_logger.warning("local_fallback_timeout", extra={"test_name": c.get("name"), "timeout_sec": timeout_sec})
                             except Exception:
                                 pass
                         except Exception as e:
@@ -823,7 +1210,7 @@ class Engine:
                             end = time.perf_counter()
                             duration_ms = (end - start) * 1000.0
                             try:
-                                logging.getLogger("patternanalyzer.engine").exception("local_fallback_exception", extra={"test_name": c.get("name"), "err": str(e)})
+                                self._engine_logger.exception("local_fallback_exception", extra={"test_name": c.get("name"), "err": str(e)})
                             except Exception:
                                 pass
                         if isinstance(res, TestResult):
@@ -852,7 +1239,7 @@ class Engine:
                                 if remaining_ms <= 0:
                                     # mark this and remaining as skipped due to budget exhaustion
                                     raw_results.append({"test_name": c['name'], "status": "skipped", "reason": "budget_exhausted"})
-                                    for rc, rf in submissions[submissions.index((c, future))+1:]:
+                                    for rc, rf in submissions[i+1:]:
                                         try:
                                             if rf is not None:
                                                 rf.cancel()
@@ -864,7 +1251,8 @@ class Engine:
                             res = future.result(timeout=timeout_sec)
                             # Normalize worker return values
                             try:
-                                logging.getLogger("patternanalyzer.engine").debug("future_completed", extra={"test_name": c.get("name")})
+                                if self._engine_logger.isEnabledFor(logging.DEBUG):
+                                    self._engine_logger.debug("future_completed", extra={"test_name": c.get("name")})
                             except Exception:
                                 pass
                             if isinstance(res, TestResult):
@@ -875,31 +1263,9 @@ class Engine:
                                     raw_results.append({"test_name": c['name'], "status": "error", "reason": res.get("reason")})
                                 else:
                                     # Attempt to detect serialized TestResult-like dict produced by sandbox_runner
-                                    if "test_name" in res and "passed" in res and "p_value" in res:
+                                    if _RUNNER_KEYS <= res.keys():
                                         try:
-                                            tr = TestResult(
-                                                test_name=res.get("test_name"),
-                                                passed=res.get("passed"),
-                                                p_value=res.get("p_value"),
-                                                category=res.get("category", "statistical"),
-                                                p_values=res.get("p_values", {}) or {},
-                                                effect_sizes=res.get("effect_sizes", {}) or {},
-                                                flags=res.get("flags", []) or [],
-                                                metrics=res.get("metrics", {}) or {},
-                                                z_score=res.get("z_score"),
-                                                evidence=res.get("evidence"),
-                                            )
-                                            # Attach observability fields if present
-                                            try:
-                                                if getattr(tr, "time_ms", None) is None:
-                                                    tr.time_ms = res.get("time_ms")
-                                            except Exception:
-                                                tr.time_ms = res.get("time_ms")
-                                            try:
-                                                if getattr(tr, "bytes_processed", None) is None:
-                                                    tr.bytes_processed = res.get("bytes_processed")
-                                            except Exception:
-                                                tr.bytes_processed = res.get("bytes_processed")
+                                            tr = TestResult.from_runner_dict(res)
                                             raw_results.append(tr)
                                         except Exception:
                                             # fallback to appending the dict
@@ -910,20 +1276,26 @@ class Engine:
                                 raw_results.append(res)
                         except concurrent.futures.TimeoutError:
                             try:
-                                future.cancel()
+                                # a running task cannot be cancelled: its worker is discarded below
+                                if not future.cancel():
+                                    pool_wedged = True
                             except Exception:
-                                pass
+                                pool_wedged = True
                             try:
-                                logging.getLogger("patternanalyzer.engine").warning("future_timeout_cancelled", extra={"test_name": c.get("name"), "timeout_sec": timeout_sec})
+                                self._engine_logger.warning("future_timeout_cancelled", extra={"test_name": c.get("name"), "timeout_sec": timeout_sec})
                             except Exception:
                                 pass
                             raw_results.append({"test_name": c['name'], "status": "error", "reason": "timeout"})
                         except Exception as e:
                             try:
-                                logging.getLogger("patternanalyzer.engine").exception("future_result_exception", extra={"test_name": c.get("name"), "err": str(e)})
+                                self._engine_logger.exception("future_result_exception", extra={"test_name": c.get("name"), "err": str(e)})
                             except Exception:
                                 pass
                             raw_results.append({"test_name": c['name'], "status": "error", "reason": str(e)})
+                if tpool is not None:
+                    tpool.shutdown(wait=True)
+                if pool_wedged:
+                    self._discard_process_pool()
  
         # Extract primary p-values for FDR correction.
         # Only include tests that provide a p_value (not None) AND have category == "statistical".
@@ -939,91 +1311,45 @@ class Engine:
         serialized_results: List[Dict[str, Any]] = []
         all_effects: List[float] = []
         visuals_conf = config.get('visuals', {})  # optional mapping plugin_name -> params
+        visual_jobs: List[Tuple[Dict[str, Any], TestResult]] = []  # (serialized entry, result)
+        log_path = config.get("log_path")
+        log_lines: List[bytes] = []  # per-test JSONL entries, appended to log_path in one write
         # Map rejected flags back to test entries that actually produced p-values
         p_idx = 0
         for r in raw_results:
             if isinstance(r, TestResult):
-                s = serialize_testresult(r)
-                s['status'] = 'completed'
                 # Only TestResult objects that contributed a p-value to the FDR (p_value not None
                 # and category == "statistical") should be mapped to the `rejected` list.
-                if r.p_value is not None and getattr(r, "category", None) == "statistical":
-                    s['fdr_rejected'] = bool(rejected[p_idx]) if p_idx < len(rejected) else False
+                fdr_rejected = False
+                if r.p_value is not None and r.category == "statistical":
+                    fdr_rejected = bool(rejected[p_idx]) if p_idx < len(rejected) else False
                     p_idx += 1
-                else:
-                    s['fdr_rejected'] = False
-                s['fdr_q'] = q
- 
-                # Expose observability fields in the serialized result when present on the TestResult
-                s['time_ms'] = getattr(r, "time_ms", None)
-                s['bytes_processed'] = getattr(r, "bytes_processed", None)
+                # serialize_testresult already carries the observability fields (time_ms, bytes_processed)
+                s = serialize_testresult(r)
+                s.update(status='completed', fdr_rejected=fdr_rejected, fdr_q=q)
  
-                # Simple JSONL logger: if user provided config['log_path'], append a line per test
-                log_path = config.get("log_path")
+                # Simple JSONL logger: if user provided config['log_path'], one line per test
                 if log_path:
                     try:
-                        log_entry = {
+                        log_lines.append(_json_dumps_bytes({
                             "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
                             "test_name": s.get("test_name"),
                             "status": s.get("status"),
                             "time_ms": s.get("time_ms"),
                             "bytes_processed": s.get("bytes_processed"),
-                        }
-                        with open(log_path, "a", encoding="utf-8") as lf:
-                            lf.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+                        }) + b"\n")
                     except Exception:
                         # never fail the analysis because logging failed
                         pass
  
-                # Attach visual artifacts produced by registered VisualPlugins.
-                visuals_artifacts: Dict[str, Dict[str, str]] = {}
-                artefact_dir = config.get('artefact_dir')
-                for vname, vplugin in self._visuals.items():
-                    vparams = visuals_conf.get(vname, {})
-                    try:
-                        out_bytes = vplugin.render(r, vparams)
-                        if isinstance(out_bytes, (bytes, bytearray)):
-                            mime = vparams.get('mime', 'image/svg+xml')
-                            if artefact_dir:
-                                # write bytes to file under artefact_dir and return path in JSON
-                                try:
-                                    os.makedirs(artefact_dir, exist_ok=True)
-                                    # choose extension based on mime
-                                    if mime == 'image/svg+xml':
-                                        ext = 'svg'
-                                    elif 'png' in mime:
-                                        ext = 'png'
-                                    elif 'jpeg' in mime or 'jpg' in mime:
-                                        ext = 'jpg'
-                                    else:
-                                        ext = 'bin'
-                                    safe_name = str(s.get('test_name') or 'visual').replace(" ", "_")
-                                    fname = f"{safe_name}_{vname}_{uuid.uuid4().hex}.{ext}"
-                                    path = os.path.join(artefact_dir, fname)
-                                    with open(path, "wb") as wf:
-                                        wf.write(bytes(out_bytes))
-                                    visuals_artifacts[vname] = {'mime': mime, 'path': path}
-                                except Exception as e:
-                                    # If writing the artifact fails, record a visual error but do not fail the test.
-                                    s.setdefault('visual_errors', []).append({'visual_name': vname, 'details': str(e)})
-                                    # skip adding this visual artifact
-                                    continue
-                            else:
-                                # fallback: embed as base64 data URI (existing behaviour)
-                                data_b64 = base64.b64encode(bytes(out_bytes)).decode('ascii')
-                                visuals_artifacts[vname] = {'mime': mime, 'data_base64': data_b64}
-                    except Exception as e:
-                        # Visual plugin failed for this result: record in visual_errors but keep test status completed.
-                        s.setdefault('visual_errors', []).append({'visual_name': vname, 'details': str(e)})
-                        # continue to next visual plugin (do not break or set overall status to error)
-                        continue
-                if visuals_artifacts:
-                    s['visuals'] = visuals_artifacts
+                # Visual artifacts are rendered once every result is serialized
+                visual_jobs.append((s, r))
  
                 serialized_results.append(s)
                 # collect effect sizes values if present
-                if isinstance(r.effect_sizes, dict):
-                    for v in r.effect_sizes.values():
+                effects = r.effect_sizes
+                if isinstance(effects, dict):
+                    for v in effects.values():
                         try:
                             all_effects.append(float(v))
                         except Exception:
@@ -1063,6 +1389,20 @@ class Engine:
                         "fdr_q": q,
                     })
  
+        if log_lines:
+            try:
+                with open(log_path, "ab") as lf:
+                    lf.write(b"".join(log_lines))
+            except Exception:
+                pass
+
+        # Attach visual artifacts produced by registered VisualPlugins.
+        if visual_jobs and len(self._visuals):
+            # Visual plugins render one after another unless the caller vouches for
+            # their thread-safety with visual_workers > 1
+            self._attach_visuals(visual_jobs, visuals_conf, config.get('artefact_dir'),
+                                 int(config.get('visual_workers', 1) or 1))
+
         # If any transforms failed but were skipped/continued due to policy, include those errors
         # in the results so they appear in the final report as error entries.
         if transform_errors:
@@ -1109,20 +1449,14 @@ class Engine:
             meta["scipy"] = None
  
         # Engine / package version
-        try:
-            meta["engine_version"] = importlib.metadata.version("patternanalyzer")
-        except Exception:
-            meta["engine_version"] = None
+        meta["engine_version"] = _package_version("patternanalyzer")
  
         # Plugins information: include class/module and best-effort package version
         def _pkg_version_for(module_name: str):
             root = (module_name.split(".") or [None])[0]
             if not root:
                 return None
-            try:
-                return importlib.metadata.version(root)
-            except Exception:
-                return None
+            return _package_version(root)
  
         plugins_info: Dict[str, List[Dict[str, Any]]] = {"transforms": [], "tests": [], "visuals": []}
         for name, plug in self._transforms.items():
@@ -1195,7 +1529,7 @@ class Engine:
         except Exception:
             meta["config_hash"] = None
         try:
-            meta["input_hash"] = hashlib.sha256(input_bytes).hexdigest()
+            meta["input_hash"] = source.sha256_hex()
         except Exception:
             meta["input_hash"] = None
         output = {"results": serialized_results, "scorecard": scorecard, "meta": meta}
@@ -1466,7 +1800,7 @@ class Engine:
         and provided via the config dict (discover_beam_width, discover_max_depth,
         discover_top_k, discover_max_keylen, discover_preview_len).
         """
-        data = BytesView(input_bytes)
+        data = self._input_view(input_bytes)
         # shallow copy config to avoid mutating caller dict
         cfg = dict(config or {})
         # preserve legacy defaults
@@ -1478,6 +1812,7 @@ class Engine:
         cfg.setdefault('discover_top_k', int(cfg.get('discover_top_k', cfg.get('discover_top', 5))))
         cfg.setdefault('discover_max_keylen', int(cfg.get('discover_max_keylen', 40)))
         # Call the dedicated discovery module; fall back to legacy _beam_discover on error
+        # Both paths read meta.input_hash from the view, so a fallback reuses the hash
         try:
             return discovery.beam_search_discover(data, cfg)
         except Exception:
@@ -1581,19 +1916,16 @@ class Engine:
         p_idx = 0
         for r in raw_results:
             if isinstance(r, TestResult):
-                s = serialize_testresult(r)
-                s['status'] = 'completed'
-                if r.p_value is not None and getattr(r, "category", None) == "statistical":
-                    s['fdr_rejected'] = bool(rejected[p_idx]) if p_idx < len(rejected) else False
+                fdr_rejected = False
+                if r.p_value is not None and r.category == "statistical":
+                    fdr_rejected = bool(rejected[p_idx]) if p_idx < len(rejected) else False
                     p_idx += 1
-                else:
-                    s['fdr_rejected'] = False
-                s['fdr_q'] = q
-                s['time_ms'] = getattr(r, "time_ms", None)
-                s['bytes_processed'] = getattr(r, "bytes_processed", None)
+                s = serialize_testresult(r)
+                s.update(status='completed', fdr_rejected=fdr_rejected, fdr_q=q)
                 serialized_results.append(s)
-                if isinstance(r.effect_sizes, dict):
-                    for v in r.effect_sizes.values():
+                effects = r.effect_sizes
+                if isinstance(effects, dict):
+                    for v in effects.values():
                         try:
                             all_effects.append(float(v))
                         except Exception:
@@ -1630,7 +1962,8 @@ class Engine:
  
         output = {"results": serialized_results, "scorecard": scorecard, "meta": meta}
         try:
-            logging.getLogger(__name__).debug("Engine.analyze returning output - results count: %d", len(serialized_results))
+            if self._engine_logger.isEnabledFor(logging.DEBUG):
+                self._engine_logger.debug("Engine.analyze returning output - results count: %d", len(serialized_results))
         except Exception:
             pass
         return output
@@ -3,10 +3,11 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Union
+import hashlib
 import math
 
 
-@dataclass
+@dataclass(slots=True)
 class TestResult:
     """Test result container.
 
@@ -53,6 +54,28 @@ class TestResult:
         """Backwards-compatible read-only accessor for legacy 'details' name."""
         return self.metrics
 
+    @classmethod
+    def from_runner_dict(cls, d: Dict[str, Any]) -> "TestResult":
+        """Rebuild a result from its serialized dict (e.g. sandbox_runner output).
+
+        Missing or null optional fields fall back to their defaults; validation
+        in __post_init__ still applies.
+        """
+        return cls(
+            d["test_name"],
+            d["passed"],
+            d["p_value"],
+            d.get("category", "statistical"),
+            d.get("p_values") or {},
+            d.get("effect_sizes") or {},
+            d.get("flags") or [],
+            d.get("metrics") or {},
+            d.get("z_score"),
+            d.get("evidence"),
+            d.get("time_ms"),
+            d.get("bytes_processed"),
+        )
+
 
 def serialize_testresult(result: TestResult) -> Dict[str, Any]:
     """Serialize a TestResult into a JSON-compatible dict following the canonical schema.
@@ -78,19 +101,10 @@ def serialize_testresult(result: TestResult) -> Dict[str, Any]:
         "metrics": metrics,
         "z_score": result.z_score,
         "evidence": result.evidence,
+        # Observability fields (None when not measured)
+        "time_ms": result.time_ms,
+        "bytes_processed": result.bytes_processed,
     }
-
-    # Attach observability fields when present
-    if getattr(result, "time_ms", None) is not None:
-        out["time_ms"] = result.time_ms
-    else:
-        out["time_ms"] = None
-
-    if getattr(result, "bytes_processed", None) is not None:
-        out["bytes_processed"] = result.bytes_processed
-    else:
-        out["bytes_processed"] = None
-
     return out
 
 class BytesView:
@@ -101,6 +115,7 @@ class BytesView:
             self._view = memoryview(data)
         else:
             self._view = data
+        self._sha256: Optional[str] = None
 
     @property
     def data(self) -> memoryview:
@@ -117,6 +132,12 @@ class BytesView:
         """Convert to bytes."""
         return bytes(self._view)
 
+    def sha256_hex(self) -> str:
+        """Hex SHA-256 of the data (the reports' ``input_hash``), computed once per view."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self._view).hexdigest()
+        return self._sha256
+
     def bit_view(self) -> list[int]:
         """Get real bit-level view. Returns list of bits (MSB-first per byte)."""
         try:
@@ -209,5 +230,10 @@ class VisualPlugin(BasePlugin):
 
     @abstractmethod
     def render(self, result: TestResult, params: Dict[str, Any]) -> bytes:
-        """Generate visualization bytes (e.g., SVG/PNG)."""
+        """Generate visualization bytes (e.g., SVG/PNG).
+
+        With the ``visual_workers`` config above 1, different visual plugins render
+        concurrently on separate threads, so ``render`` must then be thread-safe:
+        avoid process-global state such as ``matplotlib.pyplot``'s current figure.
+        """
         pass
\ No newline at end of file
@@ -1,4 +1,5 @@
 from typing import Dict, Any
+import os
 import time
 
 from patternanalyzer.plugin_api import TestPlugin, TestResult
@@ -34,4 +35,32 @@ class BlockingTest(TestPlugin):
     def run(self, data, params: Dict[str, Any]) -> TestResult:
         sleep_seconds = float(params.get("sleep", 1.0))
         time.sleep(sleep_seconds)
-        return TestResult(test_name=params.get("name", "blocking"), passed=True, p_value=1.0, category="statistical", p_values={"blocking": 1.0})
\ No newline at end of file
+        return TestResult(test_name=params.get("name", "blocking"), passed=True, p_value=1.0, category="statistical", p_values={"blocking": 1.0})
+
+
+class ViewHoldingTest(TestPlugin):
+    """Test whose result keeps a NumPy view of the input buffer.
+
+    Intended to exercise shared-memory cleanup in parallel execution.
+    """
+
+    def describe(self) -> str:
+        return "Buffer-holding test for shared-memory cleanup"
+
+    def run(self, data, params: Dict[str, Any]) -> TestResult:
+        import numpy as np
+        head = np.frombuffer(data.data, dtype=np.uint8)[:4]
+        return TestResult(test_name=params.get("name", "viewholding"), passed=True, p_value=1.0, category="statistical", metrics={"head": head})
+
+
+class CrashingTest(TestPlugin):
+    """Test whose process exits abruptly, as a crashing native extension would.
+
+    Intended to exercise sandbox isolation in parallel execution.
+    """
+
+    def describe(self) -> str:
+        return "Crashing test for sandbox isolation"
+
+    def run(self, data, params: Dict[str, Any]) -> TestResult:
+        os._exit(int(params.get("code", 70)))
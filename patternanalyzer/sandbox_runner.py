@@ -1,19 +1,22 @@
 """Subprocess runner for sandboxed plugin execution.
 
-Reads a JSON payload from stdin with keys:
+Reads a one-line JSON header from stdin with keys:
   - module: module name containing the plugin class
   - class: class name of the plugin
   - test_name: test name (for error messages)
-  - data_b64: base64-encoded input bytes (or null)
+  - data_len: number of raw input bytes following the header line (or null)
   - params: params dict for plugin.run/safe_run
   - mem_mb: optional memory limit in megabytes (best-effort; Unix-only)
 
+A header carrying base64-encoded input in ``data_b64`` instead of ``data_len``
+is still accepted.
+
 Writes a single JSON object to stdout describing either a serialized TestResult-like
 dict or an error dict: {"status":"error","reason": "..."}.
 """
 import sys
 import json
-import base64
+import binascii
 import time
 import traceback
 import os
@@ -21,7 +24,8 @@ import os
 
 def main():
     try:
-        raw = sys.stdin.read()
+        stdin = sys.stdin.buffer
+        raw = stdin.readline()
         if not raw:
             print(json.dumps({"status": "error", "reason": "no_input"}))
             return
@@ -29,14 +33,20 @@ def main():
         module = payload.get("module")
         cls_name = payload.get("class")
         test_name = payload.get("test_name")
+        data_len = payload.get("data_len")
         data_b64 = payload.get("data_b64")
         params = payload.get("params", {}) or {}
         mem_mb = payload.get("mem_mb")
 
         data_bytes = None
-        if data_b64 is not None:
+        if data_len is not None:
+            data_bytes = stdin.read(data_len)
+            if len(data_bytes) != data_len:
+                print(json.dumps({"status": "error", "reason": f"truncated_input:{len(data_bytes)}/{data_len}"}))
+                return
+        elif data_b64 is not None:
             try:
-                data_bytes = base64.b64decode(data_b64)
+                data_bytes = binascii.a2b_base64(data_b64)
             except Exception as e:
                 print(json.dumps({"status": "error", "reason": f"invalid_base64:{e}"}))
                 return
@@ -91,8 +101,6 @@ def main():
                     pass
                 out = serialize_testresult(res)
                 out["status"] = "completed"
-                out["time_ms"] = getattr(res, "time_ms", None)
-                out["bytes_processed"] = getattr(res, "bytes_processed", None)
                 print(json.dumps(out, default=str))
                 return
             else:
@@ -0,0 +1,24 @@
+import base64
+
+import pytest
+
+pytest.importorskip("streamlit")
+import app
+
+
+def test_decode_text_input_base64():
+    payload = bytes(range(256)) * 3
+    assert app.decode_text_input(base64.b64encode(payload).decode() + "\n") == payload
+
+
+def test_decode_text_input_line_wrapped_base64():
+    payload = bytes(range(256)) * 3
+    wrapped = base64.encodebytes(payload).decode()
+    assert "\n" in wrapped.strip()
+    assert app.decode_text_input(wrapped) == payload
+    assert app.decode_text_input(wrapped.replace("\n", "\r\n")) == payload
+
+
+def test_decode_text_input_plain_text():
+    for text in ("hello world", "abcd efg", "ünïcode"):
+        assert app.decode_text_input(text) == text.encode("utf-8")
@@ -0,0 +1,86 @@
+from patternanalyzer import discovery
+
+PLAIN = b"The quick brown fox jumps over the lazy dog while the cat sleeps in the sun. "
+
+
+def _xor(bts, key):
+    return bytes(c ^ key[i % len(key)] for i, c in enumerate(bts))
+
+
+def test_single_byte_xor_candidates_recover_key():
+    cands = discovery.apply_single_byte_xor_candidates(_xor(PLAIN, b"\x5a"), top_n=3)
+    k, dec, _ = cands[0]
+    assert k == 0x5A
+    assert dec == PLAIN
+
+
+def test_single_byte_xor_scores_match_per_key_scoring():
+    ct = _xor(PLAIN, b"\x13")
+    for k, dec, score in discovery.apply_single_byte_xor_candidates(ct, top_n=8):
+        assert dec == _xor(ct, bytes([k]))
+        expected = (discovery.printable_ratio(dec) * 1.5) - (discovery.shannon_entropy(dec) / 8.0) \
+            - (discovery.english_chi_squared_score(dec) * 0.01)
+        assert abs(score - expected) < 1e-9
+
+
+def test_estimate_repeating_xor_key_recovers_key():
+    key, score = discovery.estimate_repeating_xor_key(_xor(PLAIN * 4, b"\x01\x02\x03\x04"), 4)
+    assert key == b"\x01\x02\x03\x04"
+    assert score > 1.0
+
+
+def test_kasiski_candidates_rank_key_length_divisors():
+    # repeats of a 6-byte period: distances are multiples of 6
+    cands = discovery.kasiski_candidates(b"ABCxyz" * 20, max_keylen=12)
+    assert cands[:4] == [2, 3, 6, 4]
+    assert discovery.kasiski_candidates(b"short") == []
+
+
+def test_single_byte_xor_pruning_matches_full_ranking():
+    ct = _xor(PLAIN, b"\x42") + bytes(range(0, 256, 7))
+    full = discovery.apply_single_byte_xor_candidates(ct, top_n=256)
+    pruned = discovery.apply_single_byte_xor_candidates(ct, top_n=6)
+    assert [k for k, _, _ in pruned] == [k for k, _, _ in full[:6]]
+
+
+def test_beam_search_parallel_expansion_is_deterministic():
+    from patternanalyzer.plugin_api import BytesView
+    data = BytesView(_xor(PLAIN * 3, b"\x01\x02\x03\x04"))
+    seq = discovery.beam_search_discover(data, {"discover_workers": 1, "discover_max_depth": 2})
+    par = discovery.beam_search_discover(data, {"discover_workers": 4, "discover_max_depth": 2})
+    assert seq == par
+    assert seq["discoveries"]
+
+
+def test_scorers_accept_memoryview():
+    assert discovery.printable_ratio(memoryview(b"ab\x00\x01")) == 0.5
+    k, dec, _ = discovery.apply_single_byte_xor_candidates(memoryview(_xor(PLAIN, b"\x5a")), top_n=1)[0]
+    assert (k, dec) == (0x5A, PLAIN)
+
+
+def test_beam_search_input_hash_is_sha256():
+    import hashlib
+    from patternanalyzer.plugin_api import BytesView
+    data = BytesView(PLAIN)
+    out = discovery.beam_search_discover(data, {"discover_max_depth": 1})
+    assert out["meta"]["input_hash"] == hashlib.sha256(PLAIN).hexdigest() == data.sha256_hex()
+
+
+def test_beam_search_process_executor_matches_threads():
+    from patternanalyzer.plugin_api import BytesView
+    data = BytesView(_xor(PLAIN * 3, b"\x01\x02\x03\x04"))
+    cfg = {"discover_workers": 2, "discover_max_depth": 2}
+    threads = discovery.beam_search_discover(data, cfg)
+    procs = discovery.beam_search_discover(data, dict(cfg, discover_executor="process"))
+    assert threads == procs
+
+
+def test_keylen_candidates_gated_on_ioc():
+    # text-like IoC: only the single-byte length is tried
+    assert discovery.BeamCtx(PLAIN * 3).keylen_candidates(40) == [1]
+    ct = _xor(PLAIN * 3, b"\x01\x02\x03\x04")
+    assert len(discovery.BeamCtx(ct).keylen_candidates(40)) == 6
+    # long near-uniform input: only the top two lengths
+    noise = bytes((i * 167 + (i >> 8) * 13) & 0xFF for i in range(8192))
+    assert discovery.index_of_coincidence(noise) < 0.01
+    assert len(discovery.BeamCtx(noise).keylen_candidates(40)) == 2
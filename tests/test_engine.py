@@ -1,5 +1,6 @@
 import pytest
 import json
+import threading
 from patternanalyzer.engine import Engine
 from patternanalyzer.plugin_api import TransformPlugin, TestPlugin, VisualPlugin, TestResult
 
@@ -164,4 +165,153 @@ def test_report_meta_json_and_html(tmp_path):
     html_text = html_file.read_text(encoding="utf-8")
     assert "<h2>Meta</h2>" in html_text
     # config_hash should appear in the HTML (rendered via json.dumps)
-    assert str(meta.get("config_hash")) in html_text
\ No newline at end of file
+    assert str(meta.get("config_hash")) in html_text
+
+def test_legacy_beam_discover_ranks_xor_and_rot_keys():
+    from patternanalyzer.plugin_api import BytesView
+    plain = b"Attack at dawn, retreat at dusk. " * 8
+    eng = Engine()
+    # the heuristic only sees printability, so the true key ties with others
+    out = eng._beam_discover(BytesView(bytes(c ^ 0x5A for c in plain)), {"discover_top": 40})
+    found = {d["chain"][0]["params"].get("xor_value"): d for d in out["discoveries"]}
+    assert found[0x5A]["printable_ratio"] == 1.0
+    assert found[0x5A]["plaintext_preview"] == plain.decode()[:200]
+    assert out["discoveries"][0]["score"] == found[0x5A]["score"]
+    out = eng._beam_discover(BytesView(bytes((c + 200) & 0xFF for c in plain)), {"discover_top": 40})
+    assert {"name": "rot_n", "params": {"rot": 200, "mode": "dec"}} in [d["chain"][0] for d in out["discoveries"]]
+
+
+def test_bit_view_probed_once_per_analysis(monkeypatch):
+    from patternanalyzer.plugin_api import BytesView
+    calls = []
+    orig = BytesView.bit_view
+    monkeypatch.setattr(BytesView, "bit_view", lambda self: calls.append(1) or orig(self))
+    out = Engine().analyze(bytes(range(256)) * 4, {"tests": [{"name": "monobit", "params": {}}] * 3})
+    assert [r["status"] for r in out["results"]] == ["completed"] * 3
+    assert all(r["bytes_processed"] == 1024 for r in out["results"])
+    # one availability probe; the rest are the monobit runs themselves
+    assert len(calls) == 1 + 3
+
+
+def test_testresult_from_runner_dict_round_trip():
+    from patternanalyzer.plugin_api import serialize_testresult
+    tr = TestResult(test_name="t", passed=False, p_value=0.01, flags=["x"], metrics={"n": 3},
+                    time_ms=1.5, bytes_processed=10)
+    assert not hasattr(tr, "__dict__")
+    back = TestResult.from_runner_dict(serialize_testresult(tr))
+    assert back == tr
+    minimal = TestResult.from_runner_dict({"test_name": "t", "passed": True, "p_value": None, "flags": None})
+    assert minimal == TestResult(test_name="t", passed=True, p_value=None)
+    with pytest.raises(ValueError):
+        TestResult.from_runner_dict({"test_name": "t", "passed": True, "p_value": 2.0})
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_exhausted_budget_skips_remaining_tests_in_order(parallel):
+    names = ["monobit", "runs", "monobit"]
+    out = Engine().analyze(bytes(range(256)), {
+        "tests": [{"name": n, "params": {}} for n in names],
+        "budget_ms": 0,
+        "parallel": parallel,
+        "max_workers": 1,
+    })
+    assert [(r["test_name"], r["status"], r.get("reason")) for r in out["results"]] == \
+        [(n, "skipped", "budget_exhausted") for n in names]
+
+
+class TextTest(TestPlugin):
+    requires = ['text', 'no_such_view']
+
+    def describe(self):
+        return "Needs a text view"
+
+    def run(self, data, params):
+        return TestResult(test_name="texttest", passed=True, p_value=None)
+
+
+def test_requirements_checked_once_per_analysis(monkeypatch):
+    from patternanalyzer.plugin_api import BytesView
+    calls = []
+    orig = BytesView.text_view
+    monkeypatch.setattr(BytesView, "text_view", lambda self: calls.append(1) or orig(self))
+    engine = Engine()
+    engine.register_test("texttest", TextTest())
+    out = engine.analyze(b"plain ascii", {"tests": [{"name": "texttest", "params": {}}] * 3})
+    assert len(calls) == 1
+    assert [r["reason"] for r in out["results"]] == ["Required input 'no_such_view' not available"] * 3
+
+
+def test_input_hash_reused_through_bytes_view(monkeypatch):
+    import hashlib
+    from patternanalyzer import plugin_api
+    from patternanalyzer.plugin_api import BytesView
+    payload = bytes(range(256)) * 4
+    calls = []
+    monkeypatch.setattr(plugin_api, "hashlib", type("H", (), {
+        "sha256": staticmethod(lambda b: calls.append(1) or hashlib.sha256(b))}))
+    engine = Engine()
+    cfg = {"tests": [{"name": "monobit", "params": {}}]}
+    view = BytesView(payload)
+    first = engine.analyze(view, cfg)["meta"]["input_hash"]
+    assert engine.analyze(view, dict(cfg, fdr_q=0.1))["meta"]["input_hash"] == first
+    assert engine.discover(view, {"discover_max_depth": 1})["meta"]["input_hash"] == first
+    assert first == hashlib.sha256(payload).hexdigest()
+    assert len(calls) == 1
+    # plain bytes are hashed per call; the engine keeps no reference to them
+    assert engine.analyze(payload, cfg)["meta"]["input_hash"] == first
+    assert len(calls) == 2
+
+
+def test_log_records_written_as_jsonl_by_listener(tmp_path):
+    import logging
+    log_file = tmp_path / "records.jsonl"
+    engine = Engine()
+    engine.analyze(b"\x00\x01", {"tests": [], "log_path": str(log_file), "log_level": "WARNING"})
+    logger = logging.getLogger("patternanalyzer.test_listener")
+    logger.info("below level")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed %s", "once")
+    engine.close()
+    logger.warning("after close")
+    # skip the engine's per-test result lines
+    entries = [e for e in map(json.loads, log_file.read_text(encoding="utf-8").splitlines()) if "level" in e]
+    assert [(e["level"], e["logger"], e["message"]) for e in entries] == \
+        [("ERROR", "patternanalyzer.test_listener", "failed once")]
+    assert "ValueError: boom" in entries[0]["exc"]
+    assert entries[0]["timestamp"].endswith("Z")
+
+
+def test_visuals_rendered_per_plugin_in_result_order(tmp_path):
+    class RecordingVisual(VisualPlugin):
+        def __init__(self):
+            self.seen = []
+
+        def describe(self):
+            return "Records the results it renders"
+
+        def render(self, result, params):
+            self.seen.append((result.test_name, threading.current_thread().name))
+            return b"<svg/>"
+
+    engine = Engine()
+    engine.register_test("goodtest", GoodTest())
+    rec = RecordingVisual()
+    engine.register_visual("recording", rec)
+    engine.register_visual("badvisual", BadVisual())
+    # renders stay on the calling thread unless visual_workers opts into concurrency
+    for visual_workers, on_caller in ((None, True), (4, False)):
+        rec.seen.clear()
+        config = {"tests": [{"name": "goodtest", "params": {}}] * 3, "artefact_dir": str(tmp_path)}
+        if visual_workers:
+            config["visual_workers"] = visual_workers
+        out = engine.analyze(b"\x00\x01\x02", config)
+        assert [name for name, _ in rec.seen] == ["goodtest"] * 3
+        assert all((thread == threading.current_thread().name) == on_caller for _, thread in rec.seen)
+        for r in out["results"]:
+            # registration order is kept: the built-in fft_placeholder comes first
+            assert list(r["visuals"]) == ["fft_placeholder", "recording"]
+            with open(r["visuals"]["recording"]["path"], "rb") as fh:
+                assert fh.read() == b"<svg/>"
+            assert [e["visual_name"] for e in r["visual_errors"]] == ["badvisual"]
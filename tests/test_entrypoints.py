@@ -1,5 +1,6 @@
 import importlib.metadata as im
 import pytest
+from patternanalyzer import engine as engine_mod
 from patternanalyzer.engine import Engine
 from patternanalyzer.plugins.vigenere import VigenerePlugin
 from patternanalyzer.plugins.xor_const import XOPlugin
@@ -8,6 +9,7 @@ from patternanalyzer.plugins.cusum import CumulativeSumsTest
 from patternanalyzer.plugins.binary_matrix_rank import BinaryMatrixRankTest
 from patternanalyzer.plugins.longest_run import LongestRunOnesTest
 
+
 class FakeEP:
     def __init__(self, name, cls):
         self.name = name
@@ -16,6 +18,7 @@ class FakeEP:
     def load(self):
         return self._cls
 
+
 def fake_entry_points(group=None):
     if group == 'patternanalyzer.plugins':
         return [
@@ -28,6 +31,17 @@ def fake_entry_points(group=None):
         ]
     return []
 
+
+@pytest.fixture(autouse=True)
+def fresh_entry_point_cache():
+    # Engine caches entry points per process: don't see (or leak) other tests' plugins
+    engine_mod._cached_entry_points.cache_clear()
+    engine_mod._entry_point_classes.cache_clear()
+    yield
+    engine_mod._cached_entry_points.cache_clear()
+    engine_mod._entry_point_classes.cache_clear()
+
+
 def test_entrypoint_discovery(monkeypatch):
     # Monkeypatch importlib.metadata.entry_points used by Engine to return our fake EPs
     monkeypatch.setattr(im, 'entry_points', fake_entry_points)
@@ -41,6 +55,7 @@ def test_entrypoint_discovery(monkeypatch):
     assert 'binary_matrix_rank' in tests
     assert 'longest_run' in tests
 
+
 def test_entrypoint_discovery_e2e():
     # End-to-end test using the real installed entry points (requires editable install)
     eps = im.entry_points(group='patternanalyzer.plugins')
@@ -56,4 +71,95 @@ def test_entrypoint_discovery_e2e():
     # verify new plugins are present when installed
     assert 'cusum' in tests
     assert 'binary_matrix_rank' in tests
-    assert 'longest_run' in tests
\ No newline at end of file
+    assert 'longest_run' in tests
+
+
+def test_entrypoints_scanned_once_per_process(monkeypatch):
+    calls = []
+
+    def counting_entry_points(group=None):
+        calls.append(group)
+        return fake_entry_points(group)
+
+    monkeypatch.setattr(im, 'entry_points', counting_entry_points)
+    Engine()
+    e = Engine()
+    assert sorted(calls) == ['patternanalyzer.plugins', 'patternanalyzer.tests',
+                             'patternanalyzer.transforms', 'patternanalyzer.visuals']
+    assert 'vigenere' in e.get_available_transforms()
+
+
+def test_builtin_plugins_resolved_on_first_lookup(monkeypatch):
+    monkeypatch.setattr(im, 'entry_points', lambda group=None: [])
+    e = Engine()
+    assert e.get_available_tests() == ['monobit']
+    assert e.get_profile('full') == {'tests': ['monobit'], 'transforms': ['xor_const']}
+    assert 'monobit' in e._tests._specs
+    tp = e._tests['monobit']
+    assert isinstance(tp, MonobitTest)
+    assert tp.logger.name == 'patternanalyzer.plugins.monobit'
+    assert e._tests['monobit'] is tp
+    assert [type(v) for _, v in e._transforms.items()] == [XOPlugin]
+
+
+def test_typed_entry_point_groups_load_on_first_lookup(monkeypatch):
+    loaded = []
+
+    class LazyEP(FakeEP):
+        def load(self):
+            loaded.append(self.name)
+            return self._cls
+
+    groups = {
+        'patternanalyzer.transforms': [LazyEP('vigenere', VigenerePlugin)],
+        'patternanalyzer.tests': [LazyEP('cusum', CumulativeSumsTest)],
+    }
+    monkeypatch.setattr(im, 'entry_points', lambda group=None: groups.get(group, []))
+    e = Engine()
+    assert 'vigenere' in e.get_available_transforms()
+    assert 'cusum' in e.get_available_tests()
+    assert loaded == []
+    tp = e._tests['cusum']
+    assert isinstance(tp, CumulativeSumsTest)
+    assert tp.logger.name == 'patternanalyzer.plugins.cusum'
+    assert loaded == ['cusum']
+
+
+def test_plugin_that_fails_to_load_is_skipped(monkeypatch, caplog):
+    class BrokenEP(FakeEP):
+        def load(self):
+            raise ImportError("missing optional dependency")
+
+    groups = {'patternanalyzer.visuals': [BrokenEP('broken_visual', None)]}
+    monkeypatch.setattr(im, 'entry_points', lambda group=None: groups.get(group, []))
+    e = Engine()
+    assert 'broken_visual' in e.get_available_visuals()
+    with caplog.at_level('WARNING', logger='patternanalyzer.engine'):
+        out = e.analyze(b"\x00\x01\x02\x03", {"tests": [{"name": "monobit", "params": {}}]})
+    assert out["results"][0]["status"] == "completed"
+    assert "broken_visual" not in out["results"][0].get("visuals", {})
+    assert any("broken_visual" in r.getMessage() for r in caplog.records)
+    assert 'broken_visual' not in e.get_available_visuals()
+    assert e._visuals.get('broken_visual') is None
+
+
+def test_lazy_lookup_resolves_once_across_threads():
+    import threading
+    import time
+    loads = []
+
+    def slow_load():
+        loads.append(1)
+        time.sleep(0.05)
+        return MonobitTest
+
+    registry = engine_mod._PluginRegistry()
+    registry.register_lazy('monobit', slow_load)
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(registry['monobit'])) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(loads) == 1
+    assert len(got) == 4 and all(p is got[0] for p in got)
@@ -126,4 +126,25 @@ def test_plugin_categories_and_fdr_scope():
     assert res_map['block_frequency']['p_value'] is not None
 
     # Scorecard p-value distribution count must equal number of statistical tests included
-    assert out['scorecard']['p_value_distribution']['count'] == 2
\ No newline at end of file
+    assert out['scorecard']['p_value_distribution']['count'] == 2
+
+def test_benjamini_hochberg_step_up():
+    eng = Engine()
+    # sorted thresholds for q=0.05, m=5: 0.01 0.02 0.03 0.04 0.05;
+    # p=0.035 (rank 4) passes, so the smaller ranks 1-3 are rejected too even though 0.025 > 0.02
+    p = [0.2, 0.035, 0.001, 0.025, 0.021]
+    assert eng._benjamini_hochberg(p, 0.05) == [False, True, True, True, True]
+    assert eng._benjamini_hochberg([0.5, 0.9], 0.05) == [False, False]
+    assert eng._benjamini_hochberg([], 0.05) == []
+
+
+def test_pvalue_stats_large_suite_matches_small_path():
+    import statistics
+    eng = Engine()
+    ps = [0.0, 0.005, 0.01, 0.03, 0.05, 0.07, 0.1, 0.5, 1.0] * 5
+    stats = eng._pvalue_stats(ps)
+    assert stats["count"] == 45
+    assert stats["histogram"] == {"0-0.01": 10, "0.01-0.05": 10, "0.05-0.1": 10, "0.1-1.0": 15}
+    assert stats["median"] == statistics.median(ps)
+    assert stats["mean"] == pytest.approx(statistics.mean(ps), abs=1e-15)
+    assert stats["stdev"] == pytest.approx(statistics.pstdev(ps), abs=1e-15)
@@ -1,7 +1,9 @@
+import io
 import time
 import math
 from patternanalyzer.engine import Engine
-from patternanalyzer.plugins.parallel_helpers import QuickStat, BlockingTest
+from patternanalyzer.plugins.parallel_helpers import QuickStat, BlockingTest, CrashingTest
+
 
 def _find_result(results, name):
     for r in results:
@@ -9,6 +11,7 @@ def _find_result(results, name):
             return r
     return None
 
+
 def test_parallel_matches_sequential():
     eng = Engine()
     eng.register_test("quickstat", QuickStat())
@@ -32,6 +35,7 @@ def test_parallel_matches_sequential():
     assert s is not None and p is not None
     assert math.isclose(s.get("p_value"), p.get("p_value"), rel_tol=1e-9, abs_tol=1e-12)
 
+
 def test_parallel_timeout_enforced():
     eng = Engine()
     eng.register_test("blocking", BlockingTest())
@@ -46,4 +50,216 @@ def test_parallel_timeout_enforced():
     res = _find_result(out["results"], "blocking")
     assert res is not None
     assert res.get("status") == "error"
-    assert "timeout" in (res.get("reason") or "")
\ No newline at end of file
+    assert "timeout" in (res.get("reason") or "")
+
+
+def test_parallel_timeout_does_not_wedge_next_run():
+    eng = Engine()
+    eng.register_test("blocking", BlockingTest())
+    eng.register_test("quickstat", QuickStat())
+    data = bytes([0]*10)
+    config = {
+        "tests": [{"name":"blocking", "params": {"sleep": 5.0, "name":"blocking"}}],
+        "parallel": True,
+        "per_test_timeout": 0.5,
+        "max_workers": 1
+    }
+    out = eng.analyze(data, config)
+    assert _find_result(out["results"], "blocking").get("reason") == "timeout"
+    # the hung worker is gone: the next run on the same Engine gets a fresh pool
+    config["tests"] = [{"name":"quickstat", "params": {"name":"quickstat"}}]
+    start = time.perf_counter()
+    out = eng.analyze(data, config)
+    assert _find_result(out["results"], "quickstat").get("status") == "completed"
+    assert time.perf_counter() - start < 4.0
+    eng.close()
+
+
+def test_sequential_timeout_does_not_wait_for_hung_test():
+    eng = Engine()
+    eng.register_test("blocking", BlockingTest())
+    eng.register_test("quickstat", QuickStat())
+    config = {
+        "tests": [
+            {"name": "blocking", "params": {"sleep": 2.0, "name": "blocking"}},
+            {"name": "quickstat", "params": {"name": "quickstat"}},
+        ],
+        "parallel": False,
+        "per_test_timeout": 0.3,
+    }
+    start = time.perf_counter()
+    out = eng.analyze(bytes(range(10)), config)
+    assert time.perf_counter() - start < 1.5
+    assert _find_result(out["results"], "blocking").get("reason") == "timeout"
+    assert _find_result(out["results"], "quickstat").get("status") == "completed"
+
+
+def test_local_fallback_timeout_does_not_wait_for_hung_test(monkeypatch):
+    from patternanalyzer.plugin_api import BytesView
+
+    def no_bytes(self):
+        raise RuntimeError("no snapshot")
+
+    # without a bytes snapshot the parallel branch runs tests locally
+    monkeypatch.setattr(BytesView, "to_bytes", no_bytes)
+    eng = Engine()
+    eng.register_test("blocking", BlockingTest())
+    config = {
+        "tests": [
+            {"name": "blocking", "params": {"sleep": 2.0, "name": "blocking"}},
+            {"name": "blocking", "params": {"sleep": 0.0, "name": "blocking"}},
+        ],
+        "parallel": True,
+        "max_workers": 1,
+        "per_test_timeout": 0.3,
+    }
+    start = time.perf_counter()
+    out = eng.analyze(bytes(range(10)), config)
+    assert time.perf_counter() - start < 1.5
+    assert [r.get("reason") for r in out["results"]] == ["timeout", None]
+    eng.close()
+
+
+def test_parallel_runs_reuse_worker_pool():
+    eng = Engine()
+    eng.register_test("quickstat", QuickStat())
+    config = {
+        "tests": [{"name": "quickstat", "params": {"name": "quickstat"}}],
+        "parallel": True,
+        "max_workers": 2,
+    }
+    first = eng.analyze(bytes(range(200)), config)
+    pool = eng._process_pool
+    second = eng.analyze(bytes(range(200)), config)
+    assert eng._process_pool is pool
+    p1 = _find_result(first["results"], "quickstat").get("p_value")
+    assert p1 is not None and p1 == _find_result(second["results"], "quickstat").get("p_value")
+    eng.close()
+    assert eng._process_pool is None
+
+
+def test_parallel_bytes_snapshot_doubles_as_requirement_probe(monkeypatch):
+    from patternanalyzer.plugin_api import BytesView
+    calls = []
+    orig = BytesView.to_bytes
+    monkeypatch.setattr(BytesView, "to_bytes", lambda self: calls.append(1) or orig(self))
+    eng = Engine()
+    tp = QuickStat()
+    tp.requires = ["bytes"]
+    eng.register_test("quickstat", tp)
+    config = {"tests": [{"name": "quickstat", "params": {"name": "quickstat"}}] * 3,
+              "parallel": True, "max_workers": 1}
+    out = eng.analyze(bytes(range(200)), config)
+    eng.close()
+    assert [r.get("status") for r in out["results"]] == ["completed"] * 3
+    assert len(calls) == 1
+
+
+def test_worker_reuses_plugin_instance():
+    from patternanalyzer import engine as engine_mod
+    engine_mod._worker_plugin.cache_clear()
+    args = ("patternanalyzer.plugins.parallel_helpers", "QuickStat", "quickstat")
+    first = engine_mod._run_test_worker(*args, bytes(range(50)), {})
+    second = engine_mod._run_test_worker(*args, memoryview(bytes(range(50))), {})
+    assert engine_mod._worker_plugin.cache_info().currsize == 1
+    assert first.p_value == second.p_value and second.bytes_processed == 50
+    bad = engine_mod._run_test_worker("patternanalyzer.plugins.parallel_helpers", "Missing", "missing", b"x", {})
+    assert bad["status"] == "error"
+    engine_mod._worker_plugin.cache_clear()
+
+
+def test_forkserver_pool_matches_default_pool():
+    eng = Engine()
+    eng.register_test("quickstat", QuickStat())
+    config = {
+        "tests": [{"name": "quickstat", "params": {"name": "quickstat"}}, {"name": "monobit", "params": {}}],
+        "parallel": True,
+        "max_workers": 1,
+    }
+    default = eng.analyze(bytes(range(200)), config)
+    pool = eng._process_pool
+    forked = eng.analyze(bytes(range(200)), dict(config, pool_start_method="forkserver"))
+    assert eng._process_pool is not pool
+    for name in ("quickstat", "monobit"):
+        assert _find_result(forked["results"], name).get("status") == "completed"
+        assert _find_result(forked["results"], name).get("p_value") == _find_result(default["results"], name).get("p_value")
+    eng.close()
+
+
+def test_shm_worker_detaches_result_from_shared_input(monkeypatch):
+    from multiprocessing import shared_memory
+    from patternanalyzer import engine
+    closed = []
+
+    class TrackedSharedMemory(shared_memory.SharedMemory):
+        def close(self):
+            super().close()
+            closed.append(self.name)
+
+    monkeypatch.setattr(engine.shared_memory, "SharedMemory", TrackedSharedMemory)
+    data = bytes(range(16))
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        res = engine._run_test_worker_shm(shm.name, len(data), "patternanalyzer.plugins.parallel_helpers",
+                                          "ViewHoldingTest", "viewholding", {})
+        # the worker's mapping was closed and the result no longer points into it
+        assert shm.name in closed
+        assert list(res.metrics["head"]) == [0, 1, 2, 3]
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_sandbox_mode_runs_tests():
+    eng = Engine()
+    data = bytes(range(256)) * 4
+    seq = eng.analyze(data, {"tests": [{"name": "monobit", "params": {}}]})
+    for extra in ({}, {"sandbox_mem_mb": 2048}):
+        config = {"tests": [{"name": "monobit", "params": {}}], "parallel": True,
+                  "sandbox_mode": True, "max_workers": 1, "per_test_timeout": 60.0, **extra}
+        res = _find_result(eng.analyze(data, config)["results"], "monobit")
+        assert res.get("status") == "completed"
+        assert res.get("p_value") == _find_result(seq["results"], "monobit").get("p_value")
+    eng.close()
+
+
+def test_sandbox_mode_isolates_crashing_test():
+    eng = Engine()
+    eng.register_test("quickstat", QuickStat())
+    eng.register_test("crashing", CrashingTest())
+    config = {"tests": [{"name": "crashing", "params": {}}, {"name": "quickstat", "params": {"name": "quickstat"}}],
+              "parallel": True, "sandbox_mode": True, "max_workers": 1, "per_test_timeout": 60.0}
+    out = eng.analyze(bytes(range(256)), config)
+    assert _find_result(out["results"], "crashing").get("status") == "error"
+    assert _find_result(out["results"], "quickstat").get("status") == "completed"
+    eng.close()
+
+
+def test_sandbox_runner_streams_raw_bytes():
+    from patternanalyzer.engine import _run_test_subprocess
+    from patternanalyzer.plugin_api import TestResult
+    data = b"\n\x00\xff" * 1000
+    res = _run_test_subprocess("patternanalyzer.plugins.parallel_helpers", "QuickStat", "quickstat", data, {}, 60.0)
+    assert isinstance(res, TestResult)
+    assert res.bytes_processed == len(data)
+    res = _run_test_subprocess("patternanalyzer.plugins.parallel_helpers", "BlockingTest", "blocking", data, {"sleep": 30.0}, 2.0)
+    assert res == {"test_name": "blocking", "status": "error", "reason": "timeout"}
+
+
+def test_sandbox_runner_output_with_nan_is_parsed(monkeypatch):
+    from patternanalyzer import engine
+
+    class FakeProc:
+        stdin = io.BytesIO()
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def communicate(self, input=None, timeout=None):
+            return b' {"test_name": "q", "passed": true, "p_value": 0.5, "metrics": {"x": NaN}}\n', b""
+
+    monkeypatch.setattr(engine.subprocess, "Popen", FakeProc)
+    res = engine._run_test_subprocess("m", "C", "q", b"abc", {}, 5.0)
+    assert res.p_value == 0.5
+    assert math.isnan(res.metrics["x"])
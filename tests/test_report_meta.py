@@ -47,4 +47,22 @@ def test_report_meta_contains_extended_fields(tmp_path):
     html_text = html_file.read_text(encoding="utf-8")
     assert "<h2>Meta</h2>" in html_text
     # config_hash should appear in HTML (rendered via json.dumps)
-    assert str(meta.get("config_hash")) in html_text
\ No newline at end of file
+    assert str(meta.get("config_hash")) in html_text
+
+def test_package_versions_read_once_per_process(monkeypatch):
+    import importlib.metadata as im
+    from patternanalyzer import engine as engine_mod
+    calls = []
+    orig = im.version
+    monkeypatch.setattr(im, "version", lambda name: calls.append(name) or orig(name))
+    engine_mod._package_version.cache_clear()
+    try:
+        engine = Engine()
+        first = engine.analyze(b"\x00\x01\x02", {"tests": [{"name": "monobit", "params": {}}]})["meta"]
+        n = len(calls)
+        second = engine.analyze(b"\x00\x01\x02", {"tests": [{"name": "monobit", "params": {}}]})["meta"]
+        assert len(calls) == n == len(set(calls))
+        assert first["engine_version"] == second["engine_version"]
+        assert first["plugin_versions"] == second["plugin_versions"]
+    finally:
+        engine_mod._package_version.cache_clear()